@@ -1,10 +1,13 @@
 """
 VLR.gg API Integration for importing match schedules
 """
-import urllib.request
 import urllib.error
+import http.client
 import json
 import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta, timezone
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QComboBox, QSpinBox, QCheckBox,
@@ -13,6 +16,10 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont
 
+from config import (FETCH_WORKERS, FETCH_TIMEOUT, FETCH_DEADLINE,
+                    FETCH_RETRIES, FETCH_BACKOFF)
+from http_cache import response_cache, cache_ttl
+from http_pool import http_pool
 from utils import normalize_team_name
 from widgets import SmoothScrollListWidget
 
@@ -20,6 +27,14 @@ from widgets import SmoothScrollListWidget
 # VLR.gg API base URL
 API_BASE_URL = "https://vlrggapi.vercel.app/v2/match"
 
+# HTTP statuses worth retrying
+TRANSIENT_HTTP_CODES = (429, 500, 502, 503, 504)
+# Seconds between checks of the cancel flag and deadline while pages are in flight
+CANCEL_POLL_INTERVAL = 0.1
+
+# Query types fetched together by the "全部" option of the import dialog
+ALL_QUERY_TYPES = ["live_score", "upcoming_extended", "results"]
+
 # Known event keywords to tournament mapping (order matters - more specific first)
 EVENT_TO_TOURNAMENT = {
     # Masters/Champions (check first - highest priority)
@@ -67,39 +82,229 @@ EVENT_TO_TOURNAMENT = {
 }
 
 
+def page_segments(data):
+    """Match segments of one decoded API response"""
+    if data.get('status') == 'success' and data.get('data'):
+        return data['data'].get('segments', [])
+    return []
+
+
+def page_url(query_type, page):
+    return f"{API_BASE_URL}?q={query_type}&from_page={page}&to_page={page}"
+
+
+def cached_page(query_type, page, cache=response_cache):
+    """Match segments of the last good copy of a page (however old), or None"""
+    entry = cache.get(page_url(query_type, page))
+    return page_segments(entry["payload"]) if entry is not None else None
+
+
+def fetch_page(query_type, page, offline=False, cache=response_cache, timeout=FETCH_TIMEOUT):
+    """Return the match segments of one API page, through the response cache.
+    
+    A cached page younger than its query type's TTL is used as is; an older
+    one is revalidated with If-None-Match / If-Modified-Since. Network and
+    server errors are raised so the caller can retry; offline serves the
+    last good copy without touching the network (see cached_page).
+    Requests go over the shared keep-alive connection pool.
+    """
+    url = page_url(query_type, page)
+    entry = cache.get(url)
+    if entry is not None and (offline or cache.is_fresh(entry, cache_ttl(query_type))):
+        return page_segments(entry["payload"])
+    if offline:
+        raise urllib.error.URLError("离线模式下没有该页的缓存")
+    
+    headers = {'User-Agent': 'VCT Display Demo/1.0'}
+    if entry is not None:
+        if entry.get("etag"):
+            headers['If-None-Match'] = entry["etag"]
+        if entry.get("last_modified"):
+            headers['If-Modified-Since'] = entry["last_modified"]
+    
+    status, response_headers, body = http_pool.request(url, headers, timeout=timeout)
+    if status == 304 and entry is not None:
+        cache.touch(url, entry)
+        return page_segments(entry["payload"])
+    if status >= 400:
+        raise urllib.error.HTTPError(url, status, http.client.responses.get(status, ""), response_headers, None)
+    data = json.loads(body.decode('utf-8'))
+    etag = response_headers.get('ETag')
+    last_modified = response_headers.get('Last-Modified')
+    
+    # Only good responses replace the cached copy
+    if data.get('status') == 'success':
+        cache.put(url, data, etag, last_modified)
+    return page_segments(data)
+
+
+def unseen_segments(segments, seen):
+    """Segments whose match_page is not in seen yet (recording them in seen)"""
+    result = []
+    for segment in segments:
+        key = segment.get('match_page')
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+        result.append(segment)
+    return result
+
+
+def is_transient(error):
+    """True if a failed page request is worth retrying"""
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code in TRANSIENT_HTTP_CODES
+    return isinstance(error, (urllib.error.URLError, OSError))
+
+
+def describe_error(error):
+    """Short user-facing message for a failed page"""
+    # HTTPError subclasses URLError, so it must be checked first
+    if isinstance(error, urllib.error.HTTPError):
+        return f"HTTP 错误 {error.code}: {error.reason}"
+    if isinstance(error, urllib.error.URLError):
+        return f"网络错误: {str(error)}"
+    return f"错误: {str(error)}"
+
+
+class FetchCancelled(Exception):
+    pass
+
+
 class FetchWorker(QThread):
-    """Worker thread for fetching API data"""
+    """Worker thread for fetching API data.
+    
+    Pages of every query type are downloaded concurrently by up to
+    `workers` threads and reassembled in (query type, page) order. Each
+    page is emitted through page_fetched as soon as it and every page
+    before it have arrived, so the list can fill while later pages load.
+    
+    Each request has its own timeout, transient failures are retried with
+    exponential backoff, and the whole job stops at the deadline or when
+    cancel() is called. A page that still fails is served from the last
+    good cached copy and reported through page_stale, or, without one,
+    reported through page_failed and skipped; finished carries every page
+    that did arrive, with a summary of the failures as the error message.
+    """
     finished = pyqtSignal(list, str)  # matches, error_message
-    progress = pyqtSignal(int, int)  # current, total
+    progress = pyqtSignal(int, int)  # pages done, total pages
+    page_fetched = pyqtSignal(list)  # new matches of the next page in order
+    page_failed = pyqtSignal(str, int, str)  # query type, page, error message
+    page_stale = pyqtSignal(str, int, str)  # query type, page served from an old cached copy, error message
     
-    def __init__(self, query_type="upcoming", num_pages=1):
+    def __init__(self, query_type="upcoming", num_pages=1, workers=FETCH_WORKERS, offline=False,
+                 timeout=FETCH_TIMEOUT, deadline=FETCH_DEADLINE, retries=FETCH_RETRIES):
         super().__init__()
-        self.query_type = query_type
+        self.offline = offline  # Serve cached pages only, never touch the network
+        # One query type or a list of them fetched in the same job
+        self.query_types = [query_type] if isinstance(query_type, str) else list(query_type)
         self.num_pages = num_pages
+        self.workers = workers
+        self.timeout = timeout  # Seconds per request
+        self.deadline = deadline  # Seconds for the whole job
+        self.retries = retries
+        self._cancelled = threading.Event()
+    
+    def cancel(self):
+        """Stop fetching; pages already downloaded are still reported by finished"""
+        self._cancelled.set()
+    
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+    
+    def fetch_with_retries(self, query_type, page, deadline):
+        """fetch_page with retries of transient errors, within the job deadline"""
+        for attempt in range(self.retries + 1):
+            if self._cancelled.is_set():
+                raise FetchCancelled("已取消")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("超出总时限")
+            try:
+                return fetch_page(query_type, page, self.offline, timeout=min(self.timeout, remaining))
+            except Exception as e:
+                if self.offline or attempt == self.retries or not is_transient(e):
+                    raise
+            delay = FETCH_BACKOFF * 2 ** attempt
+            if self._cancelled.wait(min(delay, max(0, deadline - time.monotonic()))):
+                raise FetchCancelled("已取消")
     
     def run(self):
+        jobs = [(query_type, page) for query_type in self.query_types
+                for page in range(1, self.num_pages + 1)]
+        deadline = time.monotonic() + self.deadline
+        all_matches = []
+        failures = []
+        seen = set()  # match_page of every match emitted (pages and query types overlap)
+        ready = {}  # Job index -> segments, arrived ahead of an earlier page
+        next_index = 0
+        self.progress.emit(0, len(jobs))
+        
+        def fail(index, message):
+            query_type, page = jobs[index]
+            failures.append(f"{query_type} 第 {page} 页: {message}")
+            self.page_failed.emit(query_type, page, message)
+            ready[index] = []  # Later pages are not held back by a failed one
+        
+        def fall_back(index, message):
+            # Out of attempts: the last good copy beats a gap, but the user is told it may be old
+            query_type, page = jobs[index]
+            segments = cached_page(query_type, page)
+            if segments is None:
+                fail(index, message)
+                return
+            self.page_stale.emit(query_type, page, message)
+            ready[index] = segments
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(jobs))))
         try:
-            all_matches = []
-            for page in range(1, self.num_pages + 1):
-                self.progress.emit(page, self.num_pages)
-                url = f"{API_BASE_URL}?q={self.query_type}&from_page={page}&to_page={page}"
-                
-                req = urllib.request.Request(url, headers={
-                    'User-Agent': 'VCT Display Demo/1.0'
-                })
-                
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    data = json.loads(response.read().decode('utf-8'))
-                    
-                    if data.get('status') == 'success' and data.get('data'):
-                        segments = data['data'].get('segments', [])
+            futures = {executor.submit(self.fetch_with_retries, query_type, page, deadline): i
+                       for i, (query_type, page) in enumerate(jobs)}
+            pending = set(futures)
+            while pending and not self._cancelled.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=min(remaining, CANCEL_POLL_INTERVAL),
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures[future]
+                    try:
+                        ready[index] = future.result()
+                    except FetchCancelled as e:
+                        fail(index, str(e))
+                    except Exception as e:
+                        fall_back(index, describe_error(e))
+                while next_index in ready:
+                    segments = unseen_segments(ready.pop(next_index), seen)
+                    next_index += 1
+                    if segments:
                         all_matches.extend(segments)
-            
-            self.finished.emit(all_matches, "")
-        except urllib.error.URLError as e:
-            self.finished.emit([], f"网络错误: {str(e)}")
+                        self.page_fetched.emit(segments)
+                if done:
+                    self.progress.emit(len(jobs) - len(pending), len(jobs))
+            # Stopped early: report the pages still in flight, then what arrived after a gap
+            for future in sorted(pending, key=futures.get):
+                if self._cancelled.is_set():
+                    fail(futures[future], "已取消")
+                else:
+                    fall_back(futures[future], "超出总时限")
+            for index in sorted(i for i in ready if i >= next_index):
+                segments = unseen_segments(ready[index], seen)
+                if segments:
+                    all_matches.extend(segments)
+                    self.page_fetched.emit(segments)
         except Exception as e:
-            self.finished.emit([], f"错误: {str(e)}")
+            failures.append(describe_error(e))
+        finally:
+            # Requests already in flight end within their own timeout
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        error = ""
+        if failures:
+            error = f"{len(failures)} 页获取失败\n" + "\n".join(failures)
+        self.finished.emit(all_matches, error)
 
 
 class VLRImportDialog(QDialog):
@@ -112,6 +317,8 @@ class VLRImportDialog(QDialog):
         self.fetched_matches = []
         self.selected_matches = []
         self.worker = None
+        self.fetch_errors = []  # Messages of pages that failed in the last fetch
+        self.fetch_stale = []  # Messages of pages served from an old cached copy
         
         self.setup_ui()
     
@@ -125,16 +332,22 @@ class VLRImportDialog(QDialog):
         
         settings_layout.addWidget(QLabel("数据类型:"))
         self.query_combo = QComboBox()
-        self.query_combo.addItems(["upcoming", "upcoming_extended", "live_score", "results"])
+        for query_type in ["upcoming", "upcoming_extended", "live_score", "results"]:
+            self.query_combo.addItem(query_type, query_type)
+        self.query_combo.addItem("全部 (" + " + ".join(ALL_QUERY_TYPES) + ")", ALL_QUERY_TYPES)
         self.query_combo.setCurrentIndex(1)  # Default to upcoming_extended
         settings_layout.addWidget(self.query_combo)
         
-        settings_layout.addWidget(QLabel("页数:"))
+        settings_layout.addWidget(QLabel("页数 (每种):"))
         self.pages_spin = QSpinBox()
         self.pages_spin.setRange(1, 10)
         self.pages_spin.setValue(5)
         settings_layout.addWidget(self.pages_spin)
         
+        self.offline_check = QCheckBox("离线 (使用缓存)")
+        self.offline_check.setToolTip("只使用上次成功获取并缓存的数据，不访问网络")
+        settings_layout.addWidget(self.offline_check)
+        
         settings_layout.addStretch()
         
         self.fetch_btn = QPushButton("获取赛程")
@@ -192,18 +405,33 @@ class VLRImportDialog(QDialog):
         layout.addLayout(btn_layout)
     
     def fetch_matches(self):
-        """Fetch matches from API"""
-        self.fetch_btn.setEnabled(False)
+        """Fetch matches from API (or stop the fetch in progress)"""
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.fetch_btn.setEnabled(False)
+            self.status_label.setText("正在停止...")
+            return
+        self.fetch_btn.setText("停止获取")
+        self.fetch_errors = []
+        self.fetch_stale = []
+        self.status_label.setToolTip("")
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
+        self.fetched_matches = []
         self.match_list.clear()
+        self.populate_event_filter()
+        self.import_btn.setEnabled(False)
         self.status_label.setText("正在获取数据...")
         
         self.worker = FetchWorker(
-            self.query_combo.currentText(),
-            self.pages_spin.value()
+            self.query_combo.currentData(),
+            self.pages_spin.value(),
+            offline=self.offline_check.isChecked()
         )
         self.worker.progress.connect(self.on_progress)
+        self.worker.page_fetched.connect(self.on_page_fetched)
+        self.worker.page_failed.connect(self.on_page_failed)
+        self.worker.page_stale.connect(self.on_page_stale)
         self.worker.finished.connect(self.on_fetch_finished)
         self.worker.start()
     
@@ -212,19 +440,52 @@ class VLRImportDialog(QDialog):
         self.progress_bar.setMaximum(total)
         self.progress_bar.setValue(current)
     
+    def on_page_fetched(self, matches):
+        """Append one page of matches to the list and event filter while fetching continues"""
+        start = len(self.fetched_matches)
+        self.fetched_matches.extend(matches)
+        self.add_events(matches)
+        filter_event = self.event_filter.currentData()
+        for i, match in enumerate(matches, start):
+            self.add_match_item(i, match, filter_event)
+        self.import_btn.setEnabled(self.match_list.count() > 0)
+        self.status_label.setText(f"正在获取数据... 已获取 {len(self.fetched_matches)} 场比赛")
+    
+    def on_page_failed(self, query_type, page, message):
+        """Remember a failed page; the fetch carries on with the others"""
+        self.fetch_errors.append(f"{query_type} 第 {page} 页: {message}")
+    
+    def on_page_stale(self, query_type, page, message):
+        """Remember a page that fell back to its cached copy"""
+        self.fetch_stale.append(f"{query_type} 第 {page} 页 (使用缓存，可能已过期): {message}")
+    
     def on_fetch_finished(self, matches, error):
-        """Handle fetch completion"""
+        """Handle fetch completion (the matches were already added page by page)"""
+        self.fetch_btn.setText("获取赛程")
         self.fetch_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
         
-        if error:
+        if error and not self.fetched_matches:
             self.status_label.setText(f"错误: {error}")
             return
         
-        self.fetched_matches = matches
-        self.populate_event_filter()
-        self.populate_match_list()
-        self.status_label.setText(f"共获取 {len(matches)} 场比赛")
+        status = f"共获取 {len(self.fetched_matches)} 场比赛"
+        if self.fetch_errors:
+            # Partial result: keep what arrived, list the failed pages in the tooltip
+            status += f"，{len(self.fetch_errors)} 页获取失败"
+        if self.fetch_stale:
+            status += f"，{len(self.fetch_stale)} 页使用了可能过期的缓存"
+        if self.fetch_errors or self.fetch_stale:
+            status += " (悬停查看)"
+            self.status_label.setToolTip("\n".join(self.fetch_errors + self.fetch_stale))
+        self.status_label.setText(status)
+    
+    def done(self, result):
+        """Stop a running fetch when the dialog closes (import, cancel or window close)"""
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        super().done(result)
     
     def populate_event_filter(self):
         """Populate event filter dropdown"""
@@ -241,44 +502,61 @@ class VLRImportDialog(QDialog):
             self.event_filter.addItem(event, event)
         self.event_filter.blockSignals(False)
     
+    def add_events(self, matches):
+        """Insert the new events of matches into the filter, keeping it sorted and its selection"""
+        self.event_filter.blockSignals(True)
+        for match in matches:
+            event = match.get('match_event', '')
+            if not event or self.event_filter.findData(event) >= 0:
+                continue
+            index = 1  # After "全部赛事"
+            while index < self.event_filter.count() and self.event_filter.itemData(index) < event:
+                index += 1
+            self.event_filter.insertItem(index, event, event)
+        self.event_filter.blockSignals(False)
+    
     def populate_match_list(self, filter_event=""):
         """Populate match list with fetched data"""
         self.match_list.clear()
         
         for i, match in enumerate(self.fetched_matches):
-            event = match.get('match_event', '')
-            if filter_event and event != filter_event:
-                continue
-            
-            team1 = match.get('team1', '?')
-            team2 = match.get('team2', '?')
-            time_until = match.get('time_until_match', '')
-            timestamp = match.get('unix_timestamp', '')
-            series = match.get('match_series', '')
-            reliable = self._is_reliable_timestamp(timestamp)
-            
-            # Format display text
-            display = f"{team1} vs {team2}"
-            if timestamp:
-                if reliable:
-                    display = f"[{timestamp}] {display}"
-                else:
-                    # Show date only for unreliable timestamps
-                    date_part = timestamp.split(' ')[0] if ' ' in timestamp else timestamp
-                    display = f"[{date_part} 时间未校准] {display}"
-            elif time_until:
-                display = f"[{time_until}] {display}"
-            if series:
-                display += f" ({series})"
-            
-            item = QListWidgetItem(display)
-            item.setData(Qt.ItemDataRole.UserRole, i)  # Store original index
-            if not reliable and timestamp:
-                item.setForeground(Qt.GlobalColor.darkYellow)
-            self.match_list.addItem(item)
+            self.add_match_item(i, match, filter_event)
         
         self.import_btn.setEnabled(self.match_list.count() > 0)
     
+    def add_match_item(self, i, match, filter_event=""):
+        """Append a list item for fetched match i unless the event filter hides it"""
+        event = match.get('match_event', '')
+        if filter_event and event != filter_event:
+            return
+        
+        team1 = match.get('team1', '?')
+        team2 = match.get('team2', '?')
+        time_until = match.get('time_until_match', '')
+        timestamp = match.get('unix_timestamp', '')
+        series = match.get('match_series', '')
+        reliable = self._is_reliable_timestamp(timestamp)
+        
+        # Format display text
+        display = f"{team1} vs {team2}"
+        if timestamp:
+            if reliable:
+                display = f"[{timestamp}] {display}"
+            else:
+                # Show date only for unreliable timestamps
+                date_part = timestamp.split(' ')[0] if ' ' in timestamp else timestamp
+                display = f"[{date_part} 时间未校准] {display}"
+        elif time_until:
+            display = f"[{time_until}] {display}"
+        if series:
+            display += f" ({series})"
+        
+        item = QListWidgetItem(display)
+        item.setData(Qt.ItemDataRole.UserRole, i)  # Store original index
+        if not reliable and timestamp:
+            item.setForeground(Qt.GlobalColor.darkYellow)
+        self.match_list.addItem(item)
+    
     def apply_filter(self):
         """Apply event filter"""
         filter_event = self.event_filter.currentData()
@@ -338,8 +616,15 @@ class VLRImportDialog(QDialog):
         except Exception:
             return False
     
+    @staticmethod
+    def vlr_match_id(match_data):
+        """Stable VLR.gg id of a match: the number in its match_page ("/378663/...") or the page path"""
+        match_page = match_data.get('match_page', '') or ''
+        id_match = re.match(r'/?(\d+)', match_page)
+        return id_match.group(1) if id_match else match_page.strip('/')
+    
     def convert_match(self, match_data):
-        """Convert VLR match data to app format [date, time, tournament, match_info, remarks, bo]"""
+        """Convert VLR match data to app format [date, time, tournament, match_info, remarks, bo, match_id]"""
         team1_raw = match_data.get('team1', '?')
         team2_raw = match_data.get('team2', '?')
         event = match_data.get('match_event', '')
@@ -430,7 +715,7 @@ class VLRImportDialog(QDialog):
         # Default BO3
         bo = "BO3"
         
-        return [date_str, time_str, tournament, match_info, remarks, bo]
+        return [date_str, time_str, tournament, match_info, remarks, bo, self.vlr_match_id(match_data)]
 
 
 def show_vlr_import_dialog(parent=None):
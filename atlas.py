@@ -0,0 +1,159 @@
+"""
+Packed logo atlas for VCT Display Demo
+
+Team logos (assets/images/<region>/) and tournament logos (assets/images/vct/)
+are packed into one image per size tier plus an index of sub-rectangles, so
+icon loading is one decode per tier instead of one file per logo.
+
+Run `python atlas.py` to (re)build assets/atlas/ after changing any logo.
+"""
+import os
+import sys
+import json
+import math
+import threading
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QImage, QPainter
+
+from bundle import read_asset
+from config import ATLAS_DIR, ATLAS_TIERS, IMAGES_DIR
+
+INDEX_FILE = "index.json"
+ATLAS_VERSION = 1
+CELL_GAP = 2  # Transparent pixels between cells
+LOGO_EXTENSIONS = (".png", ".jpg", ".jpeg")
+NON_LOGO_DIRS = ("card",)  # Card backgrounds are not square logos
+
+
+def atlas_key(path, images_dir=IMAGES_DIR):
+    """Index key for an image path: its path under images_dir with '/' separators, or None"""
+    if not path:
+        return None
+    rel = os.path.relpath(os.path.abspath(path), os.path.abspath(images_dir))
+    if rel.startswith(os.pardir):
+        return None
+    return rel.replace(os.sep, "/")
+
+
+def tier_file_name(tier):
+    return f"icons_{tier}.png"
+
+
+def find_logos(images_dir=IMAGES_DIR):
+    """Sorted index keys of every logo file under images_dir"""
+    keys = []
+    for region in sorted(os.listdir(images_dir)):
+        region_dir = os.path.join(images_dir, region)
+        if region in NON_LOGO_DIRS or not os.path.isdir(region_dir):
+            continue
+        for name in sorted(os.listdir(region_dir)):
+            if name.lower().endswith(LOGO_EXTENSIONS):
+                keys.append(f"{region}/{name}")
+    return keys
+
+
+def build_atlas(images_dir=IMAGES_DIR, out_dir=ATLAS_DIR, tiers=ATLAS_TIERS):
+    """Pack every logo into one atlas per tier and write the index; returns the index"""
+    sources = {}
+    for key in find_logos(images_dir):
+        image = QImage(os.path.join(images_dir, *key.split("/")))
+        if not image.isNull():
+            sources[key] = image
+    os.makedirs(out_dir, exist_ok=True)
+
+    columns = max(1, math.ceil(math.sqrt(len(sources))))
+    rows = max(1, math.ceil(len(sources) / columns))
+    icons = {key: {} for key in sources}
+    for tier in tiers:
+        cell = tier + CELL_GAP
+        atlas = QImage(columns * cell, rows * cell, QImage.Format.Format_ARGB32_Premultiplied)
+        atlas.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(atlas)
+        for i, (key, source) in enumerate(sources.items()):
+            # Never upscale: small sources keep their size inside a larger cell
+            side = min(tier, max(source.width(), source.height()))
+            scaled = source.scaled(side, side, Qt.AspectRatioMode.KeepAspectRatio,
+                                   Qt.TransformationMode.SmoothTransformation)
+            x = (i % columns) * cell
+            y = (i // columns) * cell
+            painter.drawImage(x, y, scaled)
+            icons[key][str(tier)] = [x, y, scaled.width(), scaled.height()]
+        painter.end()
+        atlas.save(os.path.join(out_dir, tier_file_name(tier)))
+
+    index = {"version": ATLAS_VERSION, "tiers": list(tiers), "icons": icons}
+    with open(os.path.join(out_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    return index
+
+
+class IconAtlas:
+    """Read side of the atlas: sub-rectangle lookups with lazily decoded tiers.
+
+    Everything is loaded on first use. If the atlas was never built (or a
+    tier file is missing) lookups return None and callers fall back to the
+    loose logo files. Lookups are thread-safe.
+    """
+    def __init__(self, atlas_dir=ATLAS_DIR, images_dir=IMAGES_DIR):
+        self.atlas_dir = atlas_dir
+        self.images_dir = images_dir
+        self._index = None
+        self._tiers = {}  # tier -> decoded QImage (None if missing)
+        self._lock = threading.Lock()
+
+    def _icons(self):
+        if self._index is None:
+            index = {}
+            raw = read_asset(os.path.join(self.atlas_dir, INDEX_FILE))
+            try:
+                data = json.loads(bytes(raw).decode("utf-8")) if raw is not None else {}
+                if data.get("version") == ATLAS_VERSION:
+                    index = data.get("icons", {})
+            except ValueError:
+                pass
+            self._index = index
+        return self._index
+
+    def contains(self, path):
+        """True if path is packed in the atlas (no filesystem access after the first call)"""
+        return atlas_key(path, self.images_dir) in self._icons()
+
+    def image(self, path, size):
+        """Copy of the logo at path from the smallest tier holding size px, or None"""
+        with self._lock:
+            rects = self._icons().get(atlas_key(path, self.images_dir))
+            if not rects:
+                return None
+            tiers = sorted(int(tier) for tier in rects)
+            # Largest tier if size exceeds every tier but the logo was never bigger than it
+            tier = next((t for t in tiers if t >= size), None)
+            if tier is None:
+                largest = tiers[-1]
+                x, y, w, h = rects[str(largest)]
+                if max(w, h) < largest:
+                    tier = largest
+                else:
+                    return None
+            atlas = self._tier_image(tier)
+        if atlas is None:
+            return None
+        x, y, w, h = rects[str(tier)]
+        return atlas.copy(QRect(x, y, w, h))
+
+    def _tier_image(self, tier):
+        if tier not in self._tiers:
+            data = read_asset(os.path.join(self.atlas_dir, tier_file_name(tier)))
+            image = QImage.fromData(data) if data is not None else None
+            self._tiers[tier] = None if image is None or image.isNull() else image
+        return self._tiers[tier]
+
+
+# Shared instance consulted by image_cache and utils
+icon_atlas = IconAtlas()
+
+
+if __name__ == "__main__":
+    from PyQt6.QtGui import QGuiApplication
+    app = QGuiApplication(sys.argv)
+    index = build_atlas()
+    print(f"Packed {len(index['icons'])} logos into tiers {index['tiers']} in {ATLAS_DIR}")
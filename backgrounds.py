@@ -0,0 +1,144 @@
+"""
+Schedule background decoding and on-disk scaled cache for VCT Display Demo
+"""
+import os
+import hashlib
+import threading
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QImage, QImageReader, QImageIOHandler
+
+from config import BACKGROUND_CACHE_DIR, PREVIEW_BACKGROUND_WIDTH, EXPORT_RESOLUTIONS
+from image_cache import image_cache
+
+PREVIEW_WIDTH_STEP = 256  # Decode widths beyond every export width are rounded up to this
+
+_digests = {}  # (path, mtime_ns, size) -> sha1 hex digest
+_digest_lock = threading.Lock()
+
+
+def file_digest(path):
+    """SHA-1 of a file's contents, memoized on its path, mtime and size"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _digest_lock:
+        digest = _digests.get(key)
+    if digest is None:
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha1.update(chunk)
+        digest = sha1.hexdigest()
+        with _digest_lock:
+            _digests[key] = digest
+    return digest
+
+
+def cached_background_path(path, width):
+    """Location of the pre-scaled copy of path at width in the disk cache"""
+    return os.path.join(BACKGROUND_CACHE_DIR, f"{file_digest(path)}_{width}.png")
+
+
+def decode_scaled(path, width):
+    """Decode path directly at width (keeping aspect ratio) with QImageReader, or None"""
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and size.width() > 0 and size.height() > 0:
+        # The scaled size applies before EXIF rotation, so swap axes for rotated photos
+        if reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90:
+            scaled = QSize(max(1, round(size.width() * width / size.height())), width)
+        else:
+            scaled = QSize(width, max(1, round(size.height() * width / size.width())))
+        reader.setScaledSize(scaled)
+    image = reader.read()
+    if image.isNull():
+        return None
+    if image.width() != width:
+        image = image.scaledToWidth(width, Qt.TransformationMode.SmoothTransformation)
+    return image
+
+
+def load_scaled_background(path, width):
+    """Return the background at path scaled to width, via the on-disk cache.
+
+    The first request for a (file, width) pair decodes the source at the
+    target size and stores a PNG copy; later requests, including in later
+    sessions, just read that copy.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        cache_path = cached_background_path(path, width)
+    except OSError:
+        return decode_scaled(path, width)
+
+    if os.path.exists(cache_path):
+        image = QImage(cache_path)
+        if not image.isNull():
+            return image
+
+    image = decode_scaled(path, width)
+    if image is not None:
+        try:
+            os.makedirs(BACKGROUND_CACHE_DIR, exist_ok=True)
+            # Write under a temporary name so concurrent readers never see a partial file
+            tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+            if image.save(tmp_path, "PNG"):
+                os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return image
+
+
+def get_background(path, width):
+    """Background scaled to an export width, from the memory cache or the disk cache"""
+    return image_cache.cached(("background", path, width), lambda: load_scaled_background(path, width))
+
+
+def get_preview_background(path, width, device_pixel_ratio=1.0):
+    """Background for a preview width (logical pixels) on a screen with device_pixel_ratio.
+
+    Up to PREVIEW_BACKGROUND_WIDTH physical pixels it is derived from the
+    cached preview-size decode; wider or HiDPI previews start from the
+    smallest larger cached size, so the background is never upscaled.
+    The image carries the device pixel ratio.
+    """
+    physical_width = max(1, round(width * device_pixel_ratio))
+
+    def build():
+        base = get_background(path, _decode_width(physical_width))
+        if base is None:
+            return None
+        if physical_width == base.width():
+            image = QImage(base)  # Shallow copy: the shared decode keeps its own pixel ratio
+        else:
+            image = base.scaledToWidth(physical_width, Qt.TransformationMode.SmoothTransformation)
+        image.setDevicePixelRatio(device_pixel_ratio)
+        return image
+    return image_cache.cached(("preview-background", path, physical_width, device_pixel_ratio), build)
+
+
+def _decode_width(physical_width):
+    """Decode width covering physical_width: the preview size, else an export width (both already
+    in the disk cache), else physical_width rounded up so window resizes share decodes"""
+    if physical_width <= PREVIEW_BACKGROUND_WIDTH:
+        return PREVIEW_BACKGROUND_WIDTH
+    for width in sorted(width for width, _ in EXPORT_RESOLUTIONS):
+        if width >= physical_width:
+            return width
+    return -(-physical_width // PREVIEW_WIDTH_STEP) * PREVIEW_WIDTH_STEP
+
+
+def preprocess_background(path, widths=None):
+    """Fill the disk cache for the preview width and every export width"""
+    if widths is None:
+        widths = [PREVIEW_BACKGROUND_WIDTH] + [width for width, _ in EXPORT_RESOLUTIONS]
+    for width in widths:
+        load_scaled_background(path, width)
+
+
+def preprocess_background_async(path):
+    """Run preprocess_background on a daemon thread (safe: only QImage is used)"""
+    thread = threading.Thread(target=preprocess_background, args=(path,), daemon=True)
+    thread.start()
+    return thread
@@ -28,15 +28,32 @@ if errorlevel 1 (
 )
 
 :: 清理旧文件
-echo [1/3] 清理旧的编译文件...
+echo [1/4] 清理旧的编译文件...
 if exist "dist\VCT_Display.exe" del /f "dist\VCT_Display.exe"
 if exist "build" rmdir /s /q "build"
 if exist "__pycache__" rmdir /s /q "__pycache__"
 if exist "*.spec" del /f "*.spec"
 
+:: 生成图标图集 (assets\atlas)
+echo [2/4] 正在生成图标图集...
+.venv\Scripts\python.exe atlas.py
+if errorlevel 1 (
+    echo [警告] 图集生成失败，将使用单独的图标文件
+)
+
+:: 打包资源 (字体、图标、卡片背景) 为单个内存映射文件
+echo [3/4] 正在打包资源文件...
+if not exist "build" mkdir "build"
+.venv\Scripts\python.exe bundle.py build\assets.vctb
+if errorlevel 1 (
+    echo [错误] 资源打包失败
+    pause
+    exit /b 1
+)
+
 :: 编译 (添加 --clean 参数清理缓存)
-echo [2/3] 正在编译，请稍候...
-.venv\Scripts\python.exe -m PyInstaller --clean --onefile --windowed --icon=icon.ico --name="VCT_Display" --add-data="assets;assets" --add-data="icon.jpg;." --add-data="LICENSE;." main.py
+echo [4/4] 正在编译，请稍候...
+.venv\Scripts\python.exe -m PyInstaller --clean --onefile --windowed --icon=icon.ico --name="VCT_Display" --add-data="build\assets.vctb;." --add-data="icon.jpg;." --add-data="LICENSE;." main.py
 
 :: 检查结果
 echo.
@@ -0,0 +1,149 @@
+"""
+Single-file memory-mapped asset bundle for VCT Display Demo
+
+The bundle holds everything under assets/ (fonts, logos, the logo atlas and
+card backgrounds) in one indexed file that is opened and memory-mapped once.
+Asset lookups then return zero-copy memoryviews into the mapping instead of
+touching the filesystem. Without a bundle, the loose files are read instead.
+
+Layout: MAGIC, little-endian u32 index length, JSON index
+{relative path: [offset, length]} padded to 8 bytes, then the file contents
+(offsets relative to the end of the index, 8-byte aligned).
+
+Run `python bundle.py [output]` to build it (build.bat does this for the exe).
+"""
+import os
+import sys
+import json
+import mmap
+import struct
+import threading
+
+from config import ASSETS_DIR, ASSET_BUNDLE_PATH
+
+MAGIC = b"VCTBNDL1"
+ALIGNMENT = 8
+SKIP_DIRS = ("screenshot",)  # README material, not used at runtime
+
+
+def bundle_key(path, assets_dir=ASSETS_DIR):
+    """Index key for an asset path: its path under assets_dir with '/' separators, or None"""
+    if not path:
+        return None
+    rel = os.path.relpath(os.path.abspath(path), os.path.abspath(assets_dir))
+    if rel.startswith(os.pardir):
+        return None
+    return rel.replace(os.sep, "/")
+
+
+def build_bundle(out_path=ASSET_BUNDLE_PATH, assets_dir=ASSETS_DIR):
+    """Pack every runtime asset under assets_dir into out_path; returns the number of files"""
+    files = []
+    for root, dirs, names in os.walk(assets_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.relpath(os.path.join(root, d), assets_dir) not in SKIP_DIRS)
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            files.append((bundle_key(path, assets_dir), path))
+
+    index = {}
+    position = 0
+    for key, path in files:
+        size = os.path.getsize(path)
+        index[key] = [position, size]
+        position += size + (-size % ALIGNMENT)
+    index_bytes = json.dumps(index, ensure_ascii=False).encode("utf-8")
+    index_bytes += b" " * (-(len(MAGIC) + 4 + len(index_bytes)) % ALIGNMENT)
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(MAGIC)
+        out.write(struct.pack("<I", len(index_bytes)))
+        out.write(index_bytes)
+        for key, path in files:
+            with open(path, "rb") as f:
+                data = f.read()
+            out.write(data)
+            out.write(b"\0" * (-len(data) % ALIGNMENT))
+    os.replace(tmp_path, out_path)
+    return len(files)
+
+
+class AssetBundle:
+    """Read-only view of a bundle file, mapped into memory on first use"""
+    def __init__(self, path=ASSET_BUNDLE_PATH, assets_dir=ASSETS_DIR):
+        self.path = path
+        self.assets_dir = assets_dir
+        self._index = None
+        self._mmap = None
+        self._data_start = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        with self._lock:
+            if self._index is not None:
+                return
+            index = {}
+            try:
+                with open(self.path, "rb") as f:
+                    mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if mapping[:len(MAGIC)] == MAGIC:
+                    (index_size,) = struct.unpack_from("<I", mapping, len(MAGIC))
+                    start = len(MAGIC) + 4
+                    index = json.loads(bytes(mapping[start:start + index_size]).decode("utf-8"))
+                    self._data_start = start + index_size
+                    self._mmap = mapping
+                else:
+                    mapping.close()
+            except (OSError, ValueError):
+                index = {}
+            self._index = index
+
+    def covers(self, path):
+        """True if the bundle is open and path is under its assets directory"""
+        self._open()
+        return self._mmap is not None and bundle_key(path, self.assets_dir) is not None
+
+    def contains(self, path):
+        """True if the asset at path is in the bundle"""
+        self._open()
+        return bundle_key(path, self.assets_dir) in self._index
+
+    def read(self, path):
+        """Zero-copy memoryview of the asset at path, or None if it is not bundled"""
+        self._open()
+        entry = self._index.get(bundle_key(path, self.assets_dir))
+        if entry is None:
+            return None
+        offset = self._data_start + entry[0]
+        return memoryview(self._mmap)[offset:offset + entry[1]]
+
+
+# Shared instance used by read_asset / asset_exists
+asset_bundle = AssetBundle()
+
+
+def read_asset(path):
+    """Contents of an asset: a view into the bundle, else the loose file's bytes, else None"""
+    data = asset_bundle.read(path)
+    if data is not None:
+        return data
+    if not path or not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def asset_exists(path):
+    """True if the asset exists; bundled asset paths are answered from the index alone"""
+    if asset_bundle.covers(path):
+        return asset_bundle.contains(path)
+    return bool(path) and os.path.exists(path)
+
+
+if __name__ == "__main__":
+    out_path = sys.argv[1] if len(sys.argv) > 1 else ASSET_BUNDLE_PATH
+    count = build_bundle(out_path)
+    print(f"Bundled {count} assets into {out_path} ({os.path.getsize(out_path)} bytes)")
@@ -1,12 +1,54 @@
 """
 Match card widget for VCT Display Demo
 """
-import os
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QLabel, QWidget, QSizePolicy, QMenu
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont, QColor, QPixmap, QPainter, QPen, QPainterPath, QCursor, QAction
+from PyQt6.QtGui import QFont, QColor, QPixmap, QPainter, QCursor, QAction
 
-from utils import get_card_background_path, get_tournament_icon_path, get_team_icon_path
+from image_cache import image_cache, get_pixmap
+from render import card_chrome_key, get_card_chrome, parse_match_fields
+from utils import get_tournament_icon_path, get_team_icon_path
+
+
+def create_card_menu(parent, card):
+    """Build the copy/edit/delete context menu for a card widget or scene item"""
+    menu = QMenu(parent)
+    menu.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
+    menu.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground, True)
+    menu.setWindowFlags(menu.windowFlags() | Qt.WindowType.FramelessWindowHint | Qt.WindowType.NoDropShadowWindowHint)
+    menu.setStyleSheet("""
+        QMenu {
+            background-color: #ffffff;
+            border: 1px solid #d1d5db;
+            border-radius: 8px;
+            padding: 6px 0px;
+        }
+        QMenu::item {
+            background-color: transparent;
+            padding: 8px 24px;
+            margin: 0px 4px;
+            color: #111827;
+            font-weight: 600;
+        }
+        QMenu::item:selected {
+            background-color: #f3f4f6;
+            border-radius: 4px;
+        }
+    """)
+    
+    copy_action = QAction("复制", menu)
+    copy_action.triggered.connect(lambda: card.card_copy.emit(card.card_index))
+    menu.addAction(copy_action)
+    
+    edit_action = QAction("编辑", menu)
+    edit_action.triggered.connect(lambda: card.card_double_clicked.emit(card.card_index))
+    menu.addAction(edit_action)
+    
+    delete_action = QAction("删除", menu)
+    delete_action.triggered.connect(lambda: card.card_deleted.emit(card.card_index))
+    menu.addAction(delete_action)
+    
+    return menu
 
 
 class MatchCard(QFrame):
@@ -20,17 +62,19 @@ class MatchCard(QFrame):
         super().__init__(parent)
         self.cn_font_family = cn_font_family
         self.en_font_family = en_font_family
+        self.region_colors = region_colors
         self.card_index = card_index
-        self.match_data = match_data
+        self.match_data = None
+        self.rendered_data = None  # Snapshot of the fields currently displayed
         self.selected = False
         self.scale_factor = scale_factor
         
         # Scale dimensions
         sf = scale_factor
-        font_size = int(12 * sf)
-        remarks_font_size = int(10 * sf)
-        icon_size = int(24 * sf)
-        team_icon_size = int(32 * sf)
+        self.font_size = int(12 * sf)
+        self.remarks_font_size = int(10 * sf)
+        self.icon_size = int(24 * sf)
+        self.team_icon_size = int(32 * sf)
         margin_h = int(10 * sf)
         margin_v = int(8 * sf)
         spacing = int(6 * sf)
@@ -49,29 +93,6 @@ class MatchCard(QFrame):
         self.setFixedHeight(int(100 * sf))
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         
-        # Parse data: [date, time, tournament, match_info, remarks]
-        date_val = match_data[0] if len(match_data) > 0 else ""
-        time_val = match_data[1] if len(match_data) > 1 else ""
-        tournament_val = match_data[2] if len(match_data) > 2 else ""
-        match_val = match_data[3] if len(match_data) > 3 else ""
-        remarks_val = match_data[4] if len(match_data) > 4 else ""
-        
-        # Parse match_info into team_a and team_b
-        team_a, team_b = "", ""
-        if " vs " in match_val:
-            team_a, team_b = match_val.split(" vs ", 1)
-        else:
-            team_a = match_val
-        
-        # Get color based on tournament
-        region_raw = tournament_val.strip().lower()
-        row_color = region_colors.get(region_raw, QColor("#4BACC6"))
-        color_name = row_color.name()
-        
-        # Store background image path for painting
-        self.background_path = get_card_background_path(tournament_val)
-        self.border_color = color_name
-        
         # Set frame style
         self.setFrameStyle(QFrame.Shape.NoFrame)
         self.setStyleSheet(f"""
@@ -93,32 +114,24 @@ class MatchCard(QFrame):
         layout.setSpacing(spacing)
         
         # Fonts - English for team names/tournament, Chinese for date/time/remarks
-        en_font = QFont(en_font_family, font_size, QFont.Weight.Bold)
-        cn_font = QFont(cn_font_family, font_size, QFont.Weight.Bold)
+        en_font = QFont(en_font_family, self.font_size, QFont.Weight.Bold)
         
-        # Top row: Date | Time | Tournament
+        # Top row: Date | Time | BO | Tournament
         top_layout = QHBoxLayout()
         top_layout.setSpacing(int(10 * sf))
         
-        # Date
-        date_label = QLabel(date_val)
-        date_label.setFont(en_font)
-        date_label.setStyleSheet(f"color: {color_name}; background: transparent;")
-        top_layout.addWidget(date_label)
+        self.date_label = QLabel()
+        self.date_label.setFont(en_font)
+        top_layout.addWidget(self.date_label)
         
-        # Time
-        time_label = QLabel(time_val)
-        time_label.setFont(en_font)
-        time_label.setStyleSheet(f"color: {color_name}; background: transparent;")
-        top_layout.addWidget(time_label)
+        self.time_label = QLabel()
+        self.time_label.setFont(en_font)
+        top_layout.addWidget(self.time_label)
         
         # BO (after date and time)
-        bo_val = match_data[5] if len(match_data) > 5 else ""
-        if bo_val:
-            bo_label = QLabel(bo_val)
-            bo_label.setFont(en_font)
-            bo_label.setStyleSheet(f"color: {color_name}; background: transparent;")
-            top_layout.addWidget(bo_label)
+        self.bo_label = QLabel()
+        self.bo_label.setFont(en_font)
+        top_layout.addWidget(self.bo_label)
         
         top_layout.addStretch()
         
@@ -129,18 +142,13 @@ class MatchCard(QFrame):
         tournament_layout.setContentsMargins(0, 0, 0, 0)
         tournament_layout.setSpacing(int(4 * sf))
         
-        icon_path = get_tournament_icon_path(tournament_val)
-        if icon_path and os.path.exists(icon_path):
-            icon_label = QLabel()
-            pixmap = QPixmap(icon_path).scaled(icon_size, icon_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            icon_label.setPixmap(pixmap)
-            icon_label.setStyleSheet("background: transparent;")
-            tournament_layout.addWidget(icon_label)
+        self.tournament_icon_label = QLabel()
+        self.tournament_icon_label.setStyleSheet("background: transparent;")
+        tournament_layout.addWidget(self.tournament_icon_label)
         
-        tournament_label = QLabel(tournament_val.upper())
-        tournament_label.setFont(en_font)
-        tournament_label.setStyleSheet(f"color: {color_name}; background: transparent;")
-        tournament_layout.addWidget(tournament_label)
+        self.tournament_label = QLabel()
+        self.tournament_label.setFont(en_font)
+        tournament_layout.addWidget(self.tournament_label)
         
         top_layout.addWidget(tournament_widget)
         layout.addLayout(top_layout)
@@ -160,30 +168,24 @@ class MatchCard(QFrame):
         team_a_layout.setContentsMargins(0, 0, 0, 0)
         team_a_layout.setSpacing(int(4 * sf))
         
-        icon_path_a = get_team_icon_path(team_a)
-        if icon_path_a and os.path.exists(icon_path_a):
-            icon_label_a = QLabel()
-            icon_label_a.setFixedSize(team_icon_size, team_icon_size)
-            pixmap_a = QPixmap(icon_path_a).scaled(team_icon_size, team_icon_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            icon_label_a.setPixmap(pixmap_a)
-            icon_label_a.setStyleSheet("background: transparent;")
-            team_a_layout.addWidget(icon_label_a)
-        
-        team_a_label = QLabel(team_a.upper())
-        team_a_label.setFont(en_font)
-        team_a_label.setStyleSheet(f"color: {color_name}; background: transparent;")
-        team_a_layout.addWidget(team_a_label)
+        self.team_a_icon_label = QLabel()
+        self.team_a_icon_label.setFixedSize(self.team_icon_size, self.team_icon_size)
+        self.team_a_icon_label.setStyleSheet("background: transparent;")
+        team_a_layout.addWidget(self.team_a_icon_label)
+        
+        self.team_a_label = QLabel()
+        self.team_a_label.setFont(en_font)
+        team_a_layout.addWidget(self.team_a_label)
         team_a_layout.addStretch()
         
         match_layout.addWidget(team_a_widget, 2)
         
         # VS - centered
-        vs_label = QLabel("vs")
-        vs_label.setFont(en_font)
-        vs_label.setStyleSheet(f"color: {color_name}; background: transparent;")
-        vs_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        vs_label.setFixedWidth(vs_width)
-        match_layout.addWidget(vs_label, 0)
+        self.vs_label = QLabel("vs")
+        self.vs_label.setFont(en_font)
+        self.vs_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.vs_label.setFixedWidth(vs_width)
+        match_layout.addWidget(self.vs_label, 0)
         
         # Team B (name + icon) - right aligned
         team_b_widget = QWidget()
@@ -194,33 +196,90 @@ class MatchCard(QFrame):
         
         team_b_layout.addStretch()
         
-        team_b_label = QLabel(team_b.upper())
-        team_b_label.setFont(en_font)
-        team_b_label.setStyleSheet(f"color: {color_name}; background: transparent;")
-        team_b_layout.addWidget(team_b_label)
+        self.team_b_label = QLabel()
+        self.team_b_label.setFont(en_font)
+        team_b_layout.addWidget(self.team_b_label)
         
-        icon_path_b = get_team_icon_path(team_b)
-        if icon_path_b and os.path.exists(icon_path_b):
-            icon_label_b = QLabel()
-            icon_label_b.setFixedSize(team_icon_size, team_icon_size)
-            pixmap_b = QPixmap(icon_path_b).scaled(team_icon_size, team_icon_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            icon_label_b.setPixmap(pixmap_b)
-            icon_label_b.setStyleSheet("background: transparent;")
-            team_b_layout.addWidget(icon_label_b)
+        self.team_b_icon_label = QLabel()
+        self.team_b_icon_label.setFixedSize(self.team_icon_size, self.team_icon_size)
+        self.team_b_icon_label.setStyleSheet("background: transparent;")
+        team_b_layout.addWidget(self.team_b_icon_label)
         
         match_layout.addWidget(team_b_widget, 2)
         layout.addWidget(match_widget)
         
         # Bottom row: Remarks (if any)
-        if remarks_val.strip():
-            remarks_label = QLabel(remarks_val)
-            remarks_label.setFont(QFont(cn_font_family, remarks_font_size, QFont.Weight.Bold))
-            remarks_label.setStyleSheet("color: #666666; background: transparent;")
-            remarks_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(remarks_label)
+        self.remarks_label = QLabel()
+        self.remarks_label.setFont(QFont(cn_font_family, self.remarks_font_size, QFont.Weight.Bold))
+        self.remarks_label.setStyleSheet("color: #666666; background: transparent;")
+        self.remarks_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.remarks_label)
         
         # Make all child widgets transparent to mouse events so card receives clicks
         self._set_children_mouse_transparent(self)
+        
+        self.set_match(match_data)
+    
+    def set_match(self, match_data):
+        """Show match_data on this card, updating labels in place"""
+        self.match_data = match_data
+        snapshot = tuple(match_data)
+        if snapshot == self.rendered_data:
+            return
+        self.rendered_data = snapshot
+        
+        date_val, time_val, tournament_val, team_a, team_b, remarks_val, bo_val = parse_match_fields(match_data)
+        
+        # Get color based on tournament
+        region_raw = tournament_val.strip().lower()
+        row_color = self.region_colors.get(region_raw, QColor("#4BACC6"))
+        color_name = row_color.name()
+        
+        # Store tournament and border color for painting the card chrome
+        self.tournament = tournament_val
+        self.border_color = color_name
+        
+        self.date_label.setText(date_val)
+        self.time_label.setText(time_val)
+        self.bo_label.setText(bo_val)
+        self.bo_label.setVisible(bool(bo_val))
+        self.tournament_label.setText(tournament_val.upper())
+        self.team_a_label.setText(team_a.upper())
+        self.team_b_label.setText(team_b.upper())
+        self.remarks_label.setText(remarks_val)
+        self.remarks_label.setVisible(bool(remarks_val.strip()))
+        
+        color_style = f"color: {color_name}; background: transparent;"
+        for label in (self.date_label, self.time_label, self.bo_label, self.tournament_label,
+                      self.team_a_label, self.vs_label, self.team_b_label):
+            label.setStyleSheet(color_style)
+        
+        self._set_icon(self.tournament_icon_label, get_tournament_icon_path(tournament_val), self.icon_size)
+        self._set_icon(self.team_a_icon_label, get_team_icon_path(team_a), self.team_icon_size)
+        self._set_icon(self.team_b_icon_label, get_team_icon_path(team_b), self.team_icon_size)
+        self.update()
+    
+    def set_fonts(self, cn_font_family, en_font_family):
+        """Apply new font families to the labels (e.g. once a deferred font is registered)"""
+        self.cn_font_family = cn_font_family
+        self.en_font_family = en_font_family
+        en_font = QFont(en_font_family, self.font_size, QFont.Weight.Bold)
+        for label in (self.date_label, self.time_label, self.bo_label, self.tournament_label,
+                      self.team_a_label, self.vs_label, self.team_b_label):
+            label.setFont(en_font)
+        self.remarks_label.setFont(QFont(cn_font_family, self.remarks_font_size, QFont.Weight.Bold))
+    
+    def set_index(self, card_index):
+        """Update the index emitted by this card's signals"""
+        self.card_index = card_index
+    
+    @staticmethod
+    def _set_icon(label, path, size):
+        """Show a cached icon on label, hiding the label if there is none"""
+        pixmap = get_pixmap(path, size, size)
+        if pixmap is not None:
+            label.setPixmap(pixmap)
+        label.setVisible(pixmap is not None)
     
     def _set_children_mouse_transparent(self, widget):
         """Recursively set all child widgets to be transparent to mouse events"""
@@ -230,52 +289,18 @@ class MatchCard(QFrame):
                 self._set_children_mouse_transparent(child)
 
     def paintEvent(self, event):
+        # Chrome is baked once per (tournament, size, selected, DPR) and blitted
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-        
-        sf = self.scale_factor
-        border_adj = int(2 * sf)
-        corner_radius = int(8 * sf)
-        
-        # Draw rounded rect background with white base
-        rect = self.rect().adjusted(border_adj, border_adj, -border_adj, -border_adj)
-        
-        # Create rounded rect path for clipping
-        clip_path = QPainterPath()
-        clip_path.addRoundedRect(rect.x(), rect.y(), rect.width(), rect.height(), corner_radius, corner_radius)
-        
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QColor(255, 255, 255))
-        painter.drawRoundedRect(rect, corner_radius, corner_radius)
-        
-        # Draw background image with 30% opacity if exists
-        if self.background_path and os.path.exists(self.background_path):
-            pixmap = QPixmap(self.background_path)
-            if not pixmap.isNull():
-                painter.setOpacity(0.3)
-                scaled_pixmap = pixmap.scaled(rect.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
-                # Center crop with rounded clipping
-                x_offset = (scaled_pixmap.width() - rect.width()) // 2
-                y_offset = (scaled_pixmap.height() - rect.height()) // 2
-                painter.setClipPath(clip_path)
-                painter.drawPixmap(rect.x() - x_offset, rect.y() - y_offset, scaled_pixmap)
-                painter.setOpacity(1.0)
-        
-        # Draw border
-        painter.setClipping(False)
-        if self.selected:
-            # Selected state - thicker blue border
-            pen = QPen(QColor("#0ea5e9"))
-            pen.setWidth(int(4 * sf))
-        else:
-            pen = QPen(QColor(self.border_color))
-            pen.setWidth(int(2 * sf))
-        painter.setPen(pen)
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.drawRoundedRect(rect, corner_radius, corner_radius)
-        
+        painter.drawPixmap(0, 0, self._chrome_pixmap())
         painter.end()
+
+    def _chrome_pixmap(self):
+        """Return the cached pixmap of this card's background, fill and border"""
+        dpr = self.devicePixelRatioF()
+        args = (self.tournament, self.border_color, self.width(), self.height(),
+                self.scale_factor, self.selected, dpr)
+        return image_cache.cached(card_chrome_key(*args) + ("pixmap",),
+                                  lambda: QPixmap.fromImage(get_card_chrome(*args)))
     
     def set_selected(self, selected):
         """Set selection state"""
@@ -284,42 +309,7 @@ class MatchCard(QFrame):
     
     def show_context_menu(self, pos):
         """Show right-click context menu"""
-        menu = QMenu(self)
-        menu.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
-        menu.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground, True)
-        menu.setWindowFlags(menu.windowFlags() | Qt.WindowType.FramelessWindowHint | Qt.WindowType.NoDropShadowWindowHint)
-        menu.setStyleSheet("""
-            QMenu {
-                background-color: #ffffff;
-                border: 1px solid #d1d5db;
-                border-radius: 8px;
-                padding: 6px 0px;
-            }
-            QMenu::item {
-                background-color: transparent;
-                padding: 8px 24px;
-                margin: 0px 4px;
-                color: #111827;
-                font-weight: 600;
-            }
-            QMenu::item:selected {
-                background-color: #f3f4f6;
-                border-radius: 4px;
-            }
-        """)
-        
-        copy_action = QAction("复制", self)
-        copy_action.triggered.connect(lambda: self.card_copy.emit(self.card_index))
-        menu.addAction(copy_action)
-        
-        edit_action = QAction("编辑", self)
-        edit_action.triggered.connect(lambda: self.card_double_clicked.emit(self.card_index))
-        menu.addAction(edit_action)
-        
-        delete_action = QAction("删除", self)
-        delete_action.triggered.connect(lambda: self.card_deleted.emit(self.card_index))
-        menu.addAction(delete_action)
-        
+        menu = create_card_menu(self, self)
         menu.exec(self.mapToGlobal(pos))
     
     def mousePressEvent(self, event):
@@ -8,6 +8,65 @@ ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
 FONT_PATH = os.path.join(ASSETS_DIR, "font", "FoundryGridnikW03-ExtraBold.ttf")
 CN_FONT_PATH = os.path.join(ASSETS_DIR, "font", "HarmonyOS_Sans_SC_Bold.ttf")
 IMAGES_DIR = os.path.join(ASSETS_DIR, "images")
+# Packed logo atlases built by atlas.py: one image per size tier plus index.json
+ATLAS_DIR = os.path.join(ASSETS_DIR, "atlas")
+ATLAS_TIERS = [32, 64, 128]
+# Undo steps kept by the schedule editor
+HISTORY_LIMIT = 200
+# Memory-mapped bundle of everything under assets/, built by bundle.py for the exe
+ASSET_BUNDLE_PATH = os.path.join(os.path.dirname(__file__), "assets.vctb")
+
+# Byte budget for decoded icons and card backgrounds held in memory
+IMAGE_CACHE_BUDGET = 64 * 1024 * 1024
+# Byte budget for GUI-side pixmaps (card chrome, icons); kept apart so export
+# threads filling the image cache never evict (and free) a QPixmap
+PIXMAP_CACHE_BUDGET = 32 * 1024 * 1024
+
+# Export widths offered to the user, with their labels
+EXPORT_RESOLUTIONS = [
+    (960, "960px (标清)"),
+    (1080, "1080px (高清)"),
+    (1920, "1920px (全高清)"),
+    (2880, "2880px (2K)"),
+]
+DEFAULT_EXPORT_WIDTH = 1080
+
+# Ways to split an export into several images, with their labels
+EXPORT_SPLIT_MODES = [
+    ("", "不拆分"),
+    ("pages", "按行数分页"),
+    ("date", "按日期"),
+    ("tournament", "按赛事"),
+]
+DEFAULT_ROWS_PER_PAGE = 10
+
+# Pre-scaled background images, keyed by source file hash and width
+BACKGROUND_CACHE_DIR = os.path.join("cache", "backgrounds")
+# Width the preview background is decoded at before scaling to the window
+PREVIEW_BACKGROUND_WIDTH = 1920
+
+# Image export: rows rendered per strip when streaming, and the JPEG height limit
+EXPORT_STRIP_HEIGHT = 1024
+JPEG_MAX_DIMENSION = 65500
+
+# Threads rasterizing cards during export (override with "export_workers" in settings.json)
+EXPORT_WORKERS = os.cpu_count() or 1
+
+# Concurrent page downloads when importing from VLR.gg
+FETCH_WORKERS = 4
+# Idle keep-alive connections kept per API host (one per fetch worker)
+HTTP_POOL_SIZE = FETCH_WORKERS
+# Fetch limits: seconds per request, seconds for the whole import, retries of a
+# transient failure and the first retry delay (doubled on each further retry)
+FETCH_TIMEOUT = 15
+FETCH_DEADLINE = 60
+FETCH_RETRIES = 2
+FETCH_BACKOFF = 0.5
+
+# VLR.gg response cache: seconds a page is reused before revalidating, per query type
+API_CACHE_DIR = os.path.join("cache", "api")
+API_CACHE_TTL = {"live_score": 30, "upcoming": 300, "upcoming_extended": 300, "results": 3600}
+API_CACHE_DEFAULT_TTL = 300
 
 # Table headers
 HEADERS = ["日期", "时间", "赛事", "对阵信息", "备注"]
@@ -1,15 +1,17 @@
 """
 Dialog classes for VCT Display Demo
 """
-import os
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QDialogButtonBox, 
                              QLabel, QSpinBox, QListWidget, QListWidgetItem,
                              QCalendarWidget, QFrame, QGraphicsDropShadowEffect,
-                             QPushButton, QLineEdit)
+                             QPushButton, QLineEdit, QCheckBox, QComboBox)
 from PyQt6.QtCore import Qt, QDate, QTime, QSize
-from PyQt6.QtGui import QColor, QIcon
+from PyQt6.QtGui import QColor
 
-from config import TOURNAMENTS
+from config import (TOURNAMENTS, EXPORT_RESOLUTIONS, DEFAULT_EXPORT_WIDTH, EXPORT_SPLIT_MODES,
+                    DEFAULT_ROWS_PER_PAGE)
+from image_cache import get_icon
+from models import Match, split_teams
 from utils import get_tournament_icon_path
 from widgets import TwoDigitSpinBox, TeamPickerWidget
 
@@ -121,10 +123,10 @@ class TournamentPickerDialog(QDialog):
         self.list_widget.setSpacing(5)
         
         for tournament in TOURNAMENTS:
-            icon_path = get_tournament_icon_path(tournament)
+            icon = get_icon(get_tournament_icon_path(tournament), 48)
             item = QListWidgetItem(tournament.upper())
-            if icon_path and os.path.exists(icon_path):
-                item.setIcon(QIcon(icon_path))
+            if icon is not None:
+                item.setIcon(icon)
             self.list_widget.addItem(item)
         
         # Select current value
@@ -157,9 +159,7 @@ class MatchPickerDialog(QDialog):
         layout = QVBoxLayout(self)
         
         # Parse current value "A vs B"
-        team_a, team_b = "", ""
-        if " vs " in current_value:
-            team_a, team_b = current_value.split(" vs ", 1)
+        team_a, team_b = split_teams(current_value) if " vs " in current_value else ("", "")
         
         # Team A picker
         self.team_a_picker = TeamPickerWidget("Team A:")
@@ -208,12 +208,12 @@ class MatchEditDialog(QDialog):
         if match_data is None:
             match_data = ["", "", "", "", "", "BO3"]
         
-        date_val = match_data[0] if len(match_data) > 0 else ""
-        time_val = match_data[1] if len(match_data) > 1 else ""
-        tournament_val = match_data[2] if len(match_data) > 2 else ""
-        match_val = match_data[3] if len(match_data) > 3 else ""
-        remarks_val = match_data[4] if len(match_data) > 4 else ""
-        bo_val = match_data[5] if len(match_data) > 5 else "BO3"
+        # Parsed once: start time and teams come from the Match record
+        match = Match.from_list(match_data)
+        time_val = match.time
+        tournament_val = match.tournament
+        remarks_val = match.remarks
+        bo_val = match.bo or "BO3"
         
         self.setObjectName("matchEditDialog")
         layout = QVBoxLayout(self)
@@ -259,15 +259,11 @@ class MatchEditDialog(QDialog):
         self.calendar = QCalendarWidget()
         self.calendar.setGridVisible(True)
         self.calendar.setFixedHeight(230)
-        try:
-            parts = date_val.split('.')
-            if len(parts) == 3:
-                y, m, d = map(int, parts)
-            else:
-                m, d = map(int, parts)
-                y = QDate.currentDate().year()
-            self.calendar.setSelectedDate(QDate(y, m, d))
-        except:
+        starts_at = match.starts_at
+        if starts_at is not None:
+            local = starts_at.astimezone()
+            self.calendar.setSelectedDate(QDate(local.year, local.month, local.day))
+        else:
             self.calendar.setSelectedDate(QDate.currentDate())
         date_group.addWidget(self.calendar)
         datetime_layout.addLayout(date_group)
@@ -347,10 +343,10 @@ class MatchEditDialog(QDialog):
         self.tournament_list.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.tournament_list.setSpacing(8)
         for t in TOURNAMENTS:
-            icon_path = get_tournament_icon_path(t)
+            icon = get_icon(get_tournament_icon_path(t), 32)
             item = QListWidgetItem(t.upper())
-            if icon_path and os.path.exists(icon_path):
-                item.setIcon(QIcon(icon_path))
+            if icon is not None:
+                item.setIcon(icon)
             self.tournament_list.addItem(item)
         # Select current
         for i in range(self.tournament_list.count()):
@@ -362,9 +358,7 @@ class MatchEditDialog(QDialog):
         
         # Match (Team A vs Team B)
         match_section, match_section_layout = make_section("对阵")
-        team_a, team_b = "", ""
-        if " vs " in match_val:
-            team_a, team_b = match_val.split(" vs ", 1)
+        team_a, team_b = (match.team_a, match.team_b) if match.team_b is not None else ("", "")
         
         match_layout = QHBoxLayout()
         match_layout.setSpacing(12)
@@ -747,3 +741,102 @@ class MatchEditDialog(QDialog):
                 break
         
         return [date_str, time_str, tournament_str, match_str, remarks_str, bo_str]
+
+
+class ExportSettingsDialog(QDialog):
+    """Pick one or more export widths and an optional split mode"""
+    def __init__(self, parent=None, selected_widths=None):
+        super().__init__(parent)
+        self.setWindowTitle("导出设置")
+        self.setModal(True)
+        layout = QVBoxLayout(self)
+        
+        if selected_widths is None:
+            selected_widths = [DEFAULT_EXPORT_WIDTH]
+        
+        layout.addWidget(QLabel("导出宽度 (可多选，多选时按宽度分别保存):"))
+        self.width_checks = []
+        for width, label in EXPORT_RESOLUTIONS:
+            check = QCheckBox(label)
+            check.setChecked(width in selected_widths)
+            check.toggled.connect(self.update_ok_button)
+            self.width_checks.append((width, check))
+            layout.addWidget(check)
+        
+        # Optional split into several images (social platforms cap image height)
+        split_layout = QHBoxLayout()
+        split_layout.addWidget(QLabel("拆分:"))
+        self.split_combo = QComboBox()
+        for mode, label in EXPORT_SPLIT_MODES:
+            self.split_combo.addItem(label, mode)
+        split_layout.addWidget(self.split_combo, 1)
+        self.rows_label = QLabel("每页行数:")
+        split_layout.addWidget(self.rows_label)
+        self.rows_spin = QSpinBox()
+        self.rows_spin.setRange(1, 200)
+        self.rows_spin.setValue(DEFAULT_ROWS_PER_PAGE)
+        split_layout.addWidget(self.rows_spin)
+        layout.addLayout(split_layout)
+        self.split_combo.currentIndexChanged.connect(self.update_rows_visibility)
+        self.update_rows_visibility()
+        
+        self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+        self.update_ok_button()
+    
+    def update_ok_button(self):
+        """Require at least one width"""
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setEnabled(bool(self.get_widths()))
+    
+    def update_rows_visibility(self):
+        """Rows per page only applies to page splitting"""
+        is_pages = self.split_combo.currentData() == "pages"
+        self.rows_label.setVisible(is_pages)
+        self.rows_spin.setVisible(is_pages)
+    
+    def get_widths(self):
+        return [width for width, check in self.width_checks if check.isChecked()]
+    
+    def get_split_mode(self):
+        return self.split_combo.currentData()
+    
+    def get_rows_per_page(self):
+        return self.rows_spin.value()
+
+
+class ExportDataDialog(QDialog):
+    """Pick the tournament / team filters for exporting matches in matches.json format"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("导出数据")
+        self.setModal(True)
+        layout = QVBoxLayout(self)
+        
+        tournament_layout = QHBoxLayout()
+        tournament_layout.addWidget(QLabel("赛事:"))
+        self.tournament_combo = QComboBox()
+        self.tournament_combo.addItem("全部", "")
+        for tournament in TOURNAMENTS:
+            self.tournament_combo.addItem(tournament.upper(), tournament)
+        tournament_layout.addWidget(self.tournament_combo, 1)
+        layout.addLayout(tournament_layout)
+        
+        team_layout = QHBoxLayout()
+        team_layout.addWidget(QLabel("队伍:"))
+        self.team_edit = QLineEdit()
+        self.team_edit.setPlaceholderText("全部 (输入队伍名或缩写筛选)")
+        team_layout.addWidget(self.team_edit, 1)
+        layout.addLayout(team_layout)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+    
+    def get_tournament(self):
+        return self.tournament_combo.currentData() or None
+    
+    def get_team(self):
+        return self.team_edit.text().strip() or None
@@ -0,0 +1,242 @@
+"""
+Schedule image export for VCT Display Demo
+"""
+import os
+import json
+import re
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtGui import QImage, QPainter
+
+from config import EXPORT_STRIP_HEIGHT, EXPORT_WORKERS, JPEG_MAX_DIMENSION, DEFAULT_ROWS_PER_PAGE
+from render import COLUMNS, DEFAULT_FONT_FAMILY, ScheduleLayout, render_schedule_strips
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class PNGStreamWriter:
+    """Minimal 8-bit RGB PNG encoder fed strip by strip.
+
+    Scanlines are compressed as they arrive, so the full image never has to
+    exist in memory and its height is not limited by QImage.
+    """
+    def __init__(self, file_path, width, height, level=6):
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._file = open(file_path, "wb")
+        self._compressor = zlib.compressobj(level)
+        self._file.write(PNG_SIGNATURE)
+        # Width, height, bit depth 8, color type 2 (RGB), default compression/filter, no interlace
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def write_strip(self, strip):
+        """Append every row of a QImage strip (any format) to the image"""
+        rgb = strip.convertToFormat(QImage.Format.Format_RGB888)
+        bits = rgb.constBits()
+        bits.setsize(rgb.sizeInBytes())
+        data = memoryview(bits)
+        stride = rgb.bytesPerLine()
+        row_bytes = self.width * 3
+
+        raw = bytearray()
+        for y in range(rgb.height()):
+            raw.append(0)  # Filter type: none
+            raw += data[y * stride:y * stride + row_bytes]
+        compressed = self._compressor.compress(bytes(raw))
+        if compressed:
+            self._write_chunk(b"IDAT", compressed)
+        self.rows_written += rgb.height()
+
+    def close(self):
+        """Flush the compressor and finish the file"""
+        try:
+            tail = self._compressor.flush()
+            if tail:
+                self._write_chunk(b"IDAT", tail)
+            self._write_chunk(b"IEND", b"")
+        finally:
+            self._file.close()
+
+    def _write_chunk(self, chunk_type, payload):
+        self._file.write(struct.pack(">I", len(payload)))
+        self._file.write(chunk_type)
+        self._file.write(payload)
+        self._file.write(struct.pack(">I", zlib.crc32(chunk_type + payload) & 0xFFFFFFFF))
+
+
+def is_jpeg_path(file_path):
+    """True if file_path should be written as JPEG"""
+    return os.path.splitext(file_path)[1].lower() in (".jpg", ".jpeg")
+
+
+def export_schedule(matches, width, file_path, cn_font_family=DEFAULT_FONT_FAMILY,
+                    en_font_family=DEFAULT_FONT_FAMILY, background_path=None, region_colors=None,
+                    strip_height=EXPORT_STRIP_HEIGHT, workers=EXPORT_WORKERS):
+    """Render the schedule and write it to file_path.
+
+    PNG output is streamed strip by strip with bounded memory. JPEG has no
+    streaming encoder available, so strips are composited into one compact
+    RGB888 image first (limited to JPEG_MAX_DIMENSION rows). Cards are
+    rasterized on `workers` threads and composited in order.
+    Returns (width, height) on success, or None if the file could not be written.
+    """
+    layout = ScheduleLayout(len(matches), width)
+    strips = render_schedule_strips(matches, width, strip_height, cn_font_family, en_font_family,
+                                    background_path, region_colors, workers)
+
+    if is_jpeg_path(file_path):
+        if layout.height > JPEG_MAX_DIMENSION:
+            return None
+        image = QImage(width, layout.height, QImage.Format.Format_RGB888)
+        painter = QPainter(image)
+        for top, strip in strips:
+            painter.drawImage(0, top, strip)
+        painter.end()
+        return (width, layout.height) if image.save(file_path) else None
+
+    # Streamed to a temporary file so a failed export never leaves a
+    # truncated PNG in place of the previous one
+    temp_path = file_path + ".tmp"
+    written = False
+    try:
+        writer = PNGStreamWriter(temp_path, width, layout.height)
+        try:
+            for _, strip in strips:
+                writer.write_strip(strip)
+        finally:
+            writer.close()
+        os.replace(temp_path, file_path)
+        written = True
+    except OSError:
+        return None
+    finally:
+        if not written and os.path.exists(temp_path):
+            os.remove(temp_path)
+    return width, layout.height
+
+
+def batch_output_path(file_path, width, part=None):
+    """Per-width/per-part output path: schedule.png -> schedule_1080p.png, schedule_2026.3.1_1080p.png"""
+    stem, ext = os.path.splitext(file_path)
+    suffix = f"_{part}" if part else ""
+    if width is not None:
+        suffix += f"_{width}p"
+    return f"{stem}{suffix}{ext or '.png'}"
+
+
+def _safe_label(text):
+    """Make a partition label usable in a file name"""
+    label = re.sub(r"[^\w.\-]+", "_", text.strip(), flags=re.UNICODE).strip("_")
+    return label or "tbd"
+
+
+def _unique_labels(labels):
+    """Suffix _2, _3, ... to labels that clean up to the same file name (case-insensitively)"""
+    seen = set()
+    result = []
+    for label in labels:
+        unique, number = label, 2
+        while unique.casefold() in seen:
+            unique = f"{label}_{number}"
+            number += 1
+        seen.add(unique.casefold())
+        result.append(unique)
+    return result
+
+
+def partition_matches(matches, mode, rows_per_page=DEFAULT_ROWS_PER_PAGE):
+    """Split matches into [(label, matches)] parts, keeping schedule order.
+
+    mode is "pages" (at most rows_per_page card rows per part), "date"
+    (one part per date string) or "tournament" (one part per tournament).
+    """
+    if mode == "pages":
+        per_page = max(1, rows_per_page) * COLUMNS
+        return [(f"p{page + 1}", matches[start:start + per_page])
+                for page, start in enumerate(range(0, len(matches), per_page))]
+
+    field = 0 if mode == "date" else 2
+    groups = {}
+    for match_data in matches:
+        value = match_data[field] if len(match_data) > field else ""
+        key = value.strip().lower() if mode == "tournament" else value.strip()
+        groups.setdefault(key, []).append(match_data)
+    labels = _unique_labels([_safe_label(key) for key in groups])
+    return list(zip(labels, groups.values()))
+
+
+def _export_jobs(jobs, cn_font_family, en_font_family, background_path, region_colors,
+                 strip_height, workers):
+    """Run export_schedule for each (matches, width, path) job concurrently; sizes in job order"""
+    pool_size = max(1, min(len(jobs), workers))
+    per_job_workers = max(1, workers // pool_size)
+
+    def run(job):
+        matches, width, path = job
+        return export_schedule(matches, width, path, cn_font_family, en_font_family,
+                               background_path, region_colors, strip_height, per_job_workers)
+
+    with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        return list(executor.map(run, jobs))
+
+
+def export_schedule_batch(matches, widths, file_path, cn_font_family=DEFAULT_FONT_FAMILY,
+                          en_font_family=DEFAULT_FONT_FAMILY, background_path=None, region_colors=None,
+                          strip_height=EXPORT_STRIP_HEIGHT, workers=EXPORT_WORKERS):
+    """Export the schedule at several widths in one pass.
+
+    The match list and the shared image cache (decoded icons, card
+    backgrounds and the schedule background source) are reused by every
+    width, and the widths are rendered concurrently with the card workers
+    divided between them. Returns {width: (path, (width, height) or None)}.
+    """
+    widths = sorted(set(widths))
+    jobs = [(matches, width, batch_output_path(file_path, width)) for width in widths]
+    sizes = _export_jobs(jobs, cn_font_family, en_font_family, background_path, region_colors,
+                         strip_height, workers)
+    return {width: (path, size) for (_, width, path), size in zip(jobs, sizes)}
+
+
+def export_schedule_parts(matches, widths, file_path, mode, rows_per_page=DEFAULT_ROWS_PER_PAGE,
+                          cn_font_family=DEFAULT_FONT_FAMILY, en_font_family=DEFAULT_FONT_FAMILY,
+                          background_path=None, region_colors=None,
+                          strip_height=EXPORT_STRIP_HEIGHT, workers=EXPORT_WORKERS):
+    """Export the schedule split into parts (see partition_matches), one image per part and width.
+
+    Parts render concurrently with the same layout and background tiling as a
+    full export. A <name>_manifest.json listing every output and its size is
+    written next to the images. Returns (manifest_path or None, outputs).
+    """
+    widths = sorted(set(widths))
+    parts = partition_matches(matches, mode, rows_per_page)
+    jobs = []
+    labels = []
+    for label, part in parts:
+        for width in widths:
+            jobs.append((part, width, batch_output_path(file_path, width if len(widths) > 1 else None, label)))
+            labels.append(label)
+    sizes = _export_jobs(jobs, cn_font_family, en_font_family, background_path, region_colors,
+                         strip_height, workers)
+
+    outputs = []
+    for label, (part, width, path), size in zip(labels, jobs, sizes):
+        outputs.append({
+            "file": os.path.basename(path),
+            "part": label,
+            "matches": len(part),
+            "width": size[0] if size else width,
+            "height": size[1] if size else None,
+            "ok": bool(size),
+        })
+
+    manifest_path = os.path.splitext(file_path)[0] + "_manifest.json"
+    manifest = {"split": mode, "rows_per_page": rows_per_page if mode == "pages" else None,
+                "total_matches": len(matches), "outputs": outputs}
+    try:
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    except OSError:
+        manifest_path = None
+    return manifest_path, outputs
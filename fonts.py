@@ -0,0 +1,49 @@
+"""
+Application font registration for VCT Display Demo
+"""
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QFontDatabase
+
+from bundle import read_asset
+
+FALLBACK_FONT_FAMILY = "Microsoft YaHei"
+
+
+def family_from_font_id(font_id, fallback=FALLBACK_FONT_FAMILY):
+    """First family of a registered application font, or fallback"""
+    if font_id < 0:
+        return fallback
+    families = QFontDatabase.applicationFontFamilies(font_id)
+    return families[0] if families else fallback
+
+
+def register_font(path, fallback=FALLBACK_FONT_FAMILY):
+    """Register the font at path (bundled or loose) synchronously and return its family name"""
+    data = read_asset(path)
+    if data is None:
+        return fallback
+    return family_from_font_id(QFontDatabase.addApplicationFontFromData(data), fallback)
+
+
+class FontLoader(QThread):
+    """Read a (large) font off the GUI thread (a page-in when it is bundled).
+
+    Only the file read happens here; the bytes are handed back through
+    font_data so registration stays on the GUI thread. Connect font_data to
+    register_font_data and apply the returned family.
+    """
+    font_data = pyqtSignal(bytes)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+
+    def run(self):
+        data = read_asset(self.path)
+        if data is not None:
+            self.font_data.emit(bytes(data))
+
+
+def register_font_data(data, fallback=FALLBACK_FONT_FAMILY):
+    """Register font bytes read by FontLoader and return the family name"""
+    return family_from_font_id(QFontDatabase.addApplicationFontFromData(data), fallback)
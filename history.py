@@ -0,0 +1,99 @@
+"""
+Undo/redo history for VCT Display Demo
+"""
+from config import HISTORY_LIMIT
+
+
+def inverse_change(data, op, fields):
+    """The change undoing (op, fields) on data; call before applying it.
+
+    Inverses keep references to the affected rows only (rows are shared
+    with the schedule, never copied), so an entry costs memory in
+    proportion to the size of the change, not of the schedule.
+    """
+    if op == "insert":
+        return "delete", {"index": fields["index"], "count": len(fields["rows"])}
+    if op == "delete":
+        index = fields["index"]
+        return "insert", {"index": index, "rows": data[index:index + fields.get("count", 1)]}
+    if op == "update":
+        return "update", {"index": fields["index"], "row": data[fields["index"]]}
+    if op == "move":
+        return "move", {"from": fields["to"], "to": fields["from"]}
+    if op == "merge":
+        return "remove", {"indexes": list(fields["indexes"])}
+    if op == "remove":
+        return "merge", {"indexes": list(fields["indexes"]), "rows": [data[i] for i in fields["indexes"]]}
+    if op == "reorder":
+        order = fields["order"]
+        inverse = [0] * len(order)
+        for new_index, old_index in enumerate(order):
+            inverse[old_index] = new_index
+        return "reorder", {"order": inverse}
+    if op == "clear":
+        return "insert", {"index": 0, "rows": list(data)}
+    raise ValueError(f"Unknown change: {op}")
+
+
+class History:
+    """Undo and redo stacks of change groups.
+
+    A group is a list of (op, fields) inverse changes recorded for one user
+    action; it is undone by applying its changes in reverse order. Changes
+    recorded between begin() and end() form one group.
+    """
+    def __init__(self, limit=HISTORY_LIMIT):
+        self.limit = limit
+        self.undo_stack = []
+        self.redo_stack = []
+        self._group = None
+        self._depth = 0
+
+    def begin(self):
+        """Start collecting changes into one undo step"""
+        if self._depth == 0:
+            self._group = []
+        self._depth += 1
+
+    def end(self):
+        """Finish the undo step started by begin()"""
+        self._depth -= 1
+        if self._depth == 0:
+            group, self._group = self._group, None
+            if group:
+                self._push(self.undo_stack, group)
+
+    def record(self, op, fields):
+        """Record the inverse of a new user change (clears the redo stack)"""
+        self.redo_stack.clear()
+        if self._group is not None:
+            self._group.append((op, fields))
+        else:
+            self._push(self.undo_stack, [(op, fields)])
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def pop_undo(self):
+        return self.undo_stack.pop() if self.undo_stack else None
+
+    def pop_redo(self):
+        return self.redo_stack.pop() if self.redo_stack else None
+
+    def push_undo(self, group):
+        self._push(self.undo_stack, group)
+
+    def push_redo(self, group):
+        self._push(self.redo_stack, group)
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def _push(self, stack, group):
+        stack.append(group)
+        if len(stack) > self.limit:
+            del stack[0]
@@ -0,0 +1,71 @@
+"""
+On-disk cache of VLR.gg API responses for VCT Display Demo
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+
+from config import API_CACHE_DIR, API_CACHE_TTL, API_CACHE_DEFAULT_TTL
+
+
+def cache_ttl(query_type):
+    """Seconds a cached response for query_type is served without asking the server"""
+    return API_CACHE_TTL.get(query_type, API_CACHE_DEFAULT_TTL)
+
+
+class ResponseCache:
+    """Last good JSON response per URL, with its validators.
+
+    Each entry is one file under cache_dir holding the decoded payload,
+    the time it was fetched (or last revalidated) and the ETag /
+    Last-Modified headers the server sent, so stale entries can be
+    revalidated with a conditional request. Safe to use from the fetch
+    pool threads: writes go through a temporary file and a rename.
+    """
+    def __init__(self, cache_dir=API_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def entry_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url):
+        """Cached entry for url ({"url", "fetched_at", "etag", "last_modified", "payload"}) or None"""
+        try:
+            with open(self.entry_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url and "payload" in entry else None
+
+    def put(self, url, payload, etag=None, last_modified=None):
+        """Store payload as the last good response for url"""
+        entry = {"url": url, "fetched_at": time.time(), "etag": etag,
+                 "last_modified": last_modified, "payload": payload}
+        self._write(url, entry)
+        return entry
+
+    def touch(self, url, entry):
+        """Mark entry as fresh again after the server answered 304 Not Modified"""
+        entry["fetched_at"] = time.time()
+        self._write(url, entry)
+
+    @staticmethod
+    def is_fresh(entry, ttl):
+        return time.time() - entry.get("fetched_at", 0) < ttl
+
+    def _write(self, url, entry):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self.entry_path(url)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+# Shared instance used by api_import
+response_cache = ResponseCache()
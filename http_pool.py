@@ -0,0 +1,145 @@
+"""
+Keep-alive HTTP connection pool for VCT Display Demo API requests
+"""
+import ssl
+import gzip
+import atexit
+import threading
+import http.client
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from config import HTTP_POOL_SIZE
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+# Errors meaning the server dropped an idle keep-alive connection
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError,
+                           BrokenPipeError, ConnectionAbortedError)
+
+
+class ConnectionPool:
+    """Small per-host pool of persistent HTTP/1.1 connections.
+
+    request() checks a connection out for one GET, reads the whole response
+    and puts the connection back unless the server asked to close it, so a
+    multi-page import pays one TCP/TLS handshake per pooled connection
+    rather than one per page. Bodies are requested gzip-compressed and
+    decompressed transparently. The system proxy settings are honoured as
+    with urllib. Thread-safe; connection failures raise urllib.error.URLError.
+    """
+    def __init__(self, max_idle=HTTP_POOL_SIZE):
+        self.max_idle = max_idle  # Idle connections kept per host
+        self._idle = {}  # (scheme, host, port) -> [connection]
+        self._lock = threading.Lock()
+        self._context = None
+        atexit.register(self.close)
+
+    def request(self, url, headers=None, timeout=30):
+        """GET url, following redirects like urllib; returns (status, headers, body bytes)"""
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body = self._get(url, headers, timeout)
+            location = response_headers.get('Location')
+            if status not in REDIRECT_CODES or not location:
+                return status, response_headers, body
+            url = urllib.parse.urljoin(url, location)
+        # Never hand a redirect body to the caller as if it were the page
+        raise urllib.error.HTTPError(url, status, "Too many redirects", response_headers, None)
+
+    def _get(self, url, headers, timeout):
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        headers = dict(headers or {})
+        headers.setdefault('Accept-Encoding', 'gzip')
+
+        for attempt in range(2):
+            conn, reused, path = self._acquire(key, parts, timeout)
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except STALE_CONNECTION_ERRORS as e:
+                conn.close()
+                if reused and attempt == 0:
+                    continue  # Closed while idle: retry once on a new connection
+                raise urllib.error.URLError(e)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise urllib.error.URLError(e)
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            if (response.getheader('Content-Encoding') or "").lower() == "gzip":
+                try:
+                    body = gzip.decompress(body)
+                except (OSError, EOFError) as e:  # Corrupt or truncated gzip body
+                    raise urllib.error.URLError(e)
+            return response.status, response.headers, body
+
+    def close(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def _acquire(self, key, parts, timeout):
+        """An idle connection for key (or a new one), whether it was reused, and the request path"""
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        with self._lock:
+            connections = self._idle.get(key)
+            conn = connections.pop() if connections else None
+        reused = conn is not None
+        if conn is None:
+            conn = self._connect(key, timeout)
+        else:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        if getattr(conn, "absolute_paths", False):
+            path = urllib.parse.urlunsplit(parts)
+        return conn, reused, path
+
+    def _release(self, key, conn):
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < self.max_idle:
+                connections.append(conn)
+                return
+        conn.close()
+
+    def _connect(self, key, timeout):
+        scheme, host, port = key
+        proxy = urllib.request.getproxies().get(scheme)
+        if proxy and urllib.request.proxy_bypass(host):
+            proxy = None
+        if proxy:
+            proxy_parts = urllib.parse.urlsplit(proxy if "://" in proxy else "http://" + proxy)
+            proxy_host, proxy_port = proxy_parts.hostname, proxy_parts.port or 8080
+        if scheme == "https":
+            if self._context is None:
+                self._context = ssl.create_default_context()
+            if proxy:
+                conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=timeout, context=self._context)
+                conn.set_tunnel(host, port)
+            else:
+                conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._context)
+        elif proxy:
+            # Plain HTTP through a proxy sends the absolute URL
+            conn = http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout)
+            conn.absolute_paths = True
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        return conn
+
+
+# Shared pool used by api_import
+http_pool = ConnectionPool()
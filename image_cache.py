@@ -0,0 +1,236 @@
+"""
+Process-wide decoded image cache for VCT Display Demo
+"""
+import threading
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QSize, QBuffer, QByteArray, QIODevice
+from PyQt6.QtGui import QImage, QImageReader, QPixmap, QIcon
+
+from atlas import icon_atlas
+from bundle import read_asset
+from config import IMAGE_CACHE_BUDGET, PIXMAP_CACHE_BUDGET
+
+
+def _byte_size(value):
+    """Approximate decoded size of a cached QImage or QPixmap"""
+    if value is None:
+        return 0
+    if isinstance(value, QImage):
+        return value.sizeInBytes()
+    return value.width() * value.height() * value.depth() // 8
+
+
+class _LruPool:
+    """Entries of one kind with their byte total, evicted least-recently-used first"""
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.entries = OrderedDict()  # key -> (value, size in bytes)
+
+    def store(self, key, value, size):
+        """Keep value under key and return the number of evictions"""
+        # Entries larger than the whole budget are returned but never kept
+        if size > self.max_bytes:
+            return 0
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= old[1]
+        self.entries[key] = (value, size)
+        self.current_bytes += size
+        return self.evict()
+
+    def evict(self):
+        evicted = 0
+        while self.current_bytes > self.max_bytes and self.entries:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.current_bytes -= size
+            evicted += 1
+        return evicted
+
+    def clear(self):
+        self.entries.clear()
+        self.current_bytes = 0
+
+
+class ImageCache:
+    """LRU cache of decoded, scaled images keyed by (path, size, modes, kind).
+
+    QImages and QPixmaps live in separate pools, each evicted
+    least-recently-used first once its decoded size exceeds its budget.
+    QImage lookups are thread-safe (export workers use them); QPixmap and
+    QIcon lookups must happen on the GUI thread, as for any QPixmap, and
+    since only a pixmap store evicts from the pixmap pool, a pixmap is never
+    released on a worker thread.
+    """
+    def __init__(self, max_bytes=IMAGE_CACHE_BUDGET, pixmap_max_bytes=PIXMAP_CACHE_BUDGET):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._images = _LruPool(max_bytes)
+        self._pixmaps = _LruPool(pixmap_max_bytes)  # GUI thread only
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self):
+        return self._images.max_bytes
+
+    @property
+    def current_bytes(self):
+        return self._images.current_bytes + self._pixmaps.current_bytes
+
+    def set_budget(self, max_bytes, pixmap_max_bytes=None):
+        """Change the QImage (and optionally QPixmap) byte budget, evicting QImages if needed.
+
+        A smaller pixmap budget takes effect on the next pixmap store.
+        """
+        with self._lock:
+            self._images.max_bytes = max_bytes
+            if pixmap_max_bytes is not None:
+                self._pixmaps.max_bytes = pixmap_max_bytes
+            self.evictions += self._images.evict()
+
+    def clear(self):
+        """Drop every cached entry (GUI thread: releases pixmaps)"""
+        with self._lock:
+            self._images.clear()
+            self._pixmaps.clear()
+
+    def stats(self):
+        """Return hit/miss counters and current usage"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._images.entries),
+                "bytes": self._images.current_bytes,
+                "max_bytes": self._images.max_bytes,
+                "pixmap_entries": len(self._pixmaps.entries),
+                "pixmap_bytes": self._pixmaps.current_bytes,
+                "pixmap_max_bytes": self._pixmaps.max_bytes,
+            }
+
+    def image(self, path, width=0, height=0,
+              aspect_mode=Qt.AspectRatioMode.KeepAspectRatio,
+              transform_mode=Qt.TransformationMode.SmoothTransformation):
+        """Return a QImage of path scaled into width x height (0 keeps the original size), or None"""
+        key = (path, width, height, aspect_mode, transform_mode, "image")
+        found, value = self._lookup(key)
+        if found:
+            return value
+        image = self._decode(path, width, height, aspect_mode, transform_mode)
+        self._store(key, image, _byte_size(image))
+        return image
+
+    def pixmap(self, path, width=0, height=0,
+               aspect_mode=Qt.AspectRatioMode.KeepAspectRatio,
+               transform_mode=Qt.TransformationMode.SmoothTransformation):
+        """Return a QPixmap of path scaled into width x height, or None (GUI thread only)"""
+        key = (path, width, height, aspect_mode, transform_mode, "pixmap")
+        found, value = self._lookup(key)
+        if found:
+            return value
+        # Decoded directly: only the pixmap is kept, not a second copy as a QImage
+        image = self._decode(path, width, height, aspect_mode, transform_mode)
+        pixmap = QPixmap.fromImage(image) if image is not None else None
+        self._store(key, pixmap, _byte_size(pixmap))
+        return pixmap
+
+    def icon(self, path, size=0):
+        """Return a QIcon for path built from a cached pixmap, or None (GUI thread only)"""
+        pixmap = self.pixmap(path, size, size)
+        return QIcon(pixmap) if pixmap is not None else None
+
+    def cached(self, key, factory):
+        """Return the entry for key, building it with factory() on a miss.
+
+        Used for derived images (e.g. baked card chrome) that are not a plain
+        decode of one file. factory may return None for "nothing to draw".
+        """
+        found, value = self._lookup(key)
+        if found:
+            return value
+        value = factory()
+        self._store(key, value, _byte_size(value))
+        return value
+
+    def _decode(self, path, width, height, aspect_mode, transform_mode):
+        if width <= 0 and height <= 0:
+            data = read_asset(path)
+            if data is None:
+                return None
+            image = QImage.fromData(data)
+            return None if image.isNull() else image
+        # Packed logos are cut from the atlas tier; other files are decoded
+        # straight to the target size, so a full-size source (a 3560x976
+        # card background is ~14 MB) never sits in the cache
+        image = icon_atlas.image(path, max(width, height))
+        if image is None:
+            return self._decode_scaled(path, width, height, aspect_mode)
+        if width > 0 and height > 0:
+            return image.scaled(width, height, aspect_mode, transform_mode)
+        if width > 0:
+            return image.scaledToWidth(width, transform_mode)
+        return image.scaledToHeight(height, transform_mode)
+
+    @staticmethod
+    def _decode_scaled(path, width, height, aspect_mode):
+        """Decode path at the size QImage.scaled would produce, with QImageReader"""
+        data = read_asset(path)
+        if data is None:
+            return None
+        buffer = QBuffer()
+        buffer.setData(QByteArray(bytes(data)))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        reader = QImageReader(buffer)
+        size = reader.size()
+        if size.isValid() and size.width() > 0 and size.height() > 0:
+            if width > 0 and height > 0:
+                target = size.scaled(width, height, aspect_mode)
+            elif width > 0:
+                target = QSize(width, max(1, round(size.height() * width / size.width())))
+            else:
+                target = QSize(max(1, round(size.width() * height / size.height())), height)
+            reader.setScaledSize(target)
+        image = reader.read()
+        return None if image.isNull() else image
+
+    def _lookup(self, key):
+        with self._lock:
+            for pool in (self._images, self._pixmaps):
+                entry = pool.entries.get(key)
+                if entry is not None:
+                    pool.entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[0]
+            self.misses += 1
+            return False, None
+
+    def _store(self, key, value, size):
+        # None ("nothing to draw") results are kept with the QImages
+        pool = self._pixmaps if isinstance(value, QPixmap) else self._images
+        with self._lock:
+            self.evictions += pool.store(key, value, size)
+
+
+# Shared instance used by cards, widgets, dialogs and export
+image_cache = ImageCache()
+
+
+def get_image(path, width=0, height=0,
+              aspect_mode=Qt.AspectRatioMode.KeepAspectRatio,
+              transform_mode=Qt.TransformationMode.SmoothTransformation):
+    """Cached QImage lookup on the shared cache"""
+    return image_cache.image(path, width, height, aspect_mode, transform_mode)
+
+
+def get_pixmap(path, width=0, height=0,
+               aspect_mode=Qt.AspectRatioMode.KeepAspectRatio,
+               transform_mode=Qt.TransformationMode.SmoothTransformation):
+    """Cached QPixmap lookup on the shared cache"""
+    return image_cache.pixmap(path, width, height, aspect_mode, transform_mode)
+
+
+def get_icon(path, size=0):
+    """Cached QIcon lookup on the shared cache"""
+    return image_cache.icon(path, size)
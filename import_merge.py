@@ -0,0 +1,106 @@
+"""
+Merging imported matches into the schedule for VCT Display Demo
+"""
+from models import Match
+
+# Team names standing for a not-yet-decided team (after normalize_team_name)
+PLACEHOLDER_TEAMS = ("", "?", "待定")
+
+
+def fallback_key(match):
+    """Identity of a match without a VLR id: (date, teams, tournament)"""
+    return (match.date, match.teams, match.tournament)
+
+
+class ScheduleIndex:
+    """Hash index over the schedule: VLR match id -> row, (date, teams, tournament) -> row.
+
+    Built once per import in O(n); each lookup is O(1). Rows without a
+    match id (made by hand, or imported before ids were kept) are found
+    through the fallback key.
+    """
+    def __init__(self, rows=()):
+        self.by_id = {}
+        self.by_key = {}  # fallback key -> (index, match id)
+        for index, row in enumerate(rows):
+            self.add(row, index)
+
+    def add(self, match, index):
+        """Index match as row index (the first row with a given key wins)"""
+        if match.match_id:
+            self.by_id.setdefault(match.match_id, index)
+        self.by_key.setdefault(fallback_key(match), (index, match.match_id))
+
+    def replace(self, old, new, index):
+        """Re-index row index after it changed from old to new"""
+        if self.by_key.get(fallback_key(old), (None,))[0] == index:
+            del self.by_key[fallback_key(old)]
+        self.add(new, index)
+
+    def find(self, match):
+        """Index of the row that is the same match as match, or None"""
+        if match.match_id:
+            index = self.by_id.get(match.match_id)
+            if index is not None:
+                return index
+        index, match_id = self.by_key.get(fallback_key(match), (None, ""))
+        # Same date and teams but another VLR id is another match (e.g. two TBD slots)
+        if match_id and match.match_id and match_id != match.match_id:
+            return None
+        return index
+
+
+def _team(current, imported):
+    return current if imported in PLACEHOLDER_TEAMS else imported
+
+
+def merge_match(existing, imported):
+    """existing updated with what the import knows better, or existing itself if nothing changed.
+
+    Schedule fields come from the import when they are more precise: a
+    start time once it is reliable (unreliable times are imported blank),
+    and a team once it is no longer TBD. Tournament, remarks and BO may
+    have been edited by hand and are kept.
+    """
+    date, time = existing.date, existing.time
+    if imported.date and (imported.time or not existing.time):
+        date, time = imported.date, imported.time or existing.time
+    team_a = _team(existing.team_a, imported.team_a)
+    team_b = _team(existing.team_b or "", imported.team_b or "")
+    teams = f"{team_a} vs {team_b}" if team_b or existing.team_b is not None else team_a
+    match_id = existing.match_id or imported.match_id
+    if (date, time, teams, match_id) == (existing.date, existing.time, existing.teams, existing.match_id):
+        return existing
+    return Match(date, time, existing.tournament, teams, existing.remarks, existing.bo, match_id)
+
+
+def plan_import(rows, imported):
+    """Split imported matches into (new matches, [(index, updated match)], skipped count).
+
+    Each imported match is looked up in a ScheduleIndex over rows: unknown
+    matches are new, known ones are updated in place when merge_match
+    changes them and skipped otherwise. Duplicates inside the import
+    count as skipped.
+    """
+    index = ScheduleIndex(rows)
+    new_matches = []
+    updates = {}  # Row index -> updated match
+    skipped = 0
+    seen = ScheduleIndex()  # Matches of this import already handled
+    for match in imported:
+        if seen.find(match) is not None:
+            skipped += 1
+            continue
+        seen.add(match, len(new_matches))
+        row_index = index.find(match)
+        if row_index is None:
+            new_matches.append(match)
+            continue
+        current = updates.get(row_index, rows[row_index])
+        merged = merge_match(current, match)
+        if merged is current:
+            skipped += 1
+        else:
+            updates[row_index] = merged
+            index.replace(current, merged, row_index)
+    return new_matches, sorted(updates.items()), skipped
@@ -3,16 +3,32 @@ VCT Display Demo - Main Application Entry Point
 """
 import sys
 import os
+import time
+
+STARTUP_T0 = time.perf_counter()
+
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QMessageBox, QDialog, QTextBrowser, QDialogButtonBox)
-from PyQt6.QtGui import QFontDatabase, QIcon, QAction
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QIcon, QAction
 
 from config import FONT_PATH, CN_FONT_PATH
+from bundle import asset_exists
+from fonts import FALLBACK_FONT_FAMILY, FontLoader, register_font, register_font_data
 from preview import PreviewWidget
 
 # Icon path
 ICON_PATH = os.path.join(os.path.dirname(__file__), "icon.jpg")
 
+# Print startup timings with --startup-time (or VCT_STARTUP_TIME=1)
+STARTUP_TIMING = "--startup-time" in sys.argv or os.environ.get("VCT_STARTUP_TIME") == "1"
+
+
+def log_startup(stage):
+    """Print milliseconds since process start for a startup stage"""
+    if STARTUP_TIMING:
+        print(f"[startup] {stage}: {(time.perf_counter() - STARTUP_T0) * 1000:.0f} ms", flush=True)
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -24,25 +40,12 @@ class MainWindow(QMainWindow):
         if os.path.exists(ICON_PATH):
             self.setWindowIcon(QIcon(ICON_PATH))
 
-        # Load custom fonts
-        self.cn_font_family = "Microsoft YaHei"  # Fallback for Chinese
-        self.en_font_family = "Microsoft YaHei"  # Fallback for English
-        
-        # Load HarmonyOS Sans for Chinese
-        if os.path.exists(CN_FONT_PATH):
-            cn_font_id = QFontDatabase.addApplicationFont(CN_FONT_PATH)
-            if cn_font_id >= 0:
-                cn_families = QFontDatabase.applicationFontFamilies(cn_font_id)
-                if cn_families:
-                    self.cn_font_family = cn_families[0]
-        
-        # Load FoundryGridnik for English
-        if os.path.exists(FONT_PATH):
-            en_font_id = QFontDatabase.addApplicationFont(FONT_PATH)
-            if en_font_id >= 0:
-                en_families = QFontDatabase.applicationFontFamilies(en_font_id)
-                if en_families:
-                    self.en_font_family = en_families[0]
+        # Load FoundryGridnik for English (small, registered right away)
+        self.en_font_family = register_font(FONT_PATH)
+        # HarmonyOS Sans for Chinese is large: start with the fallback and
+        # switch once start_font_loading has registered it
+        self.cn_font_family = FALLBACK_FONT_FAMILY
+        self.font_loader = None
 
         # Create menu bar
         self.create_menu_bar()
@@ -58,6 +61,25 @@ class MainWindow(QMainWindow):
         # Initialize with sample data
         self.preview_widget.populate_initial_data()
     
+    def start_font_loading(self):
+        """Read the Chinese font in the background and apply it when registered"""
+        if not asset_exists(CN_FONT_PATH):
+            return
+        self.font_loader = FontLoader(CN_FONT_PATH, self)
+        self.font_loader.font_data.connect(self.on_cn_font_data)
+        self.font_loader.start()
+    
+    def on_cn_font_data(self, data):
+        """Register the Chinese font on the GUI thread and restyle the preview"""
+        self.cn_font_family = register_font_data(data)
+        self.preview_widget.set_font_families(self.cn_font_family, self.en_font_family)
+        log_startup("Chinese font ready")
+    
+    def closeEvent(self, event):
+        """Flush pending saves before the window closes"""
+        self.preview_widget.flush_saves()
+        super().closeEvent(event)
+    
     def create_menu_bar(self):
         """Create the menu bar with Help and License options"""
         menubar = self.menuBar()
@@ -82,6 +104,7 @@ class MainWindow(QMainWindow):
 • 删除比赛：选中卡片后按 Delete 键，或右键菜单选择删除
 • 复制/粘贴：Ctrl+C / Ctrl+V
 • 排序：点击"▲ 按时间排序"
+• 自动排序：勾选"自动排序"后，新增、编辑、粘贴和导入的比赛自动插入到对应时间位置
 
 【导入赛程】
 • 点击"↓ 导入赛程"从 VLR.gg 自动获取比赛数据
@@ -90,12 +113,13 @@ class MainWindow(QMainWindow):
 【导出图片】
 • 点击"导入背景"选择自定义背景图片
 • 点击"导出图片"生成高清长图
-• 支持多种分辨率：960px / 1080px / 1920px / 2880px
+• 支持多种分辨率：960px / 1080px / 1920px / 2880px，可多选一次导出
 
 【快捷键】
 • Ctrl+C：复制选中比赛
 • Ctrl+V：粘贴比赛
 • Delete：删除选中比赛
+• Ctrl+Z / Ctrl+Y：撤销 / 重做
 """
         QMessageBox.information(self, "使用说明", help_text)
     
@@ -153,6 +177,7 @@ class MainWindow(QMainWindow):
 
 
 if __name__ == "__main__":
+    log_startup("modules imported")
     app = QApplication(sys.argv)
     
     # Set application icon (for taskbar)
@@ -161,4 +186,8 @@ if __name__ == "__main__":
     
     window = MainWindow()
     window.show()
+    log_startup("window shown")
+    # Once the first frame is up: load the Chinese font and report first idle
+    QTimer.singleShot(0, window.start_font_loading)
+    QTimer.singleShot(0, lambda: log_startup("event loop idle"))
     sys.exit(app.exec())
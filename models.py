@@ -0,0 +1,109 @@
+"""
+Match record for VCT Display Demo
+"""
+import sys
+from datetime import datetime, timezone
+
+from utils import parse_match_datetime
+
+# JSON list order; match_id (the VLR.gg match id of imported matches) is only
+# written when set, so hand-made rows keep the six-field form
+FIELDS = ("date", "time", "tournament", "teams", "remarks", "bo", "match_id")
+FIELD_COUNT = len(FIELDS)
+EDIT_FIELD_COUNT = FIELDS.index("match_id")  # Fields shown, edited and copied
+# Undated matches sort after every real date, ordered by time of day
+UNDATED_SORT_KEY = datetime(9999, 12, 31, tzinfo=timezone.utc).timestamp()
+
+
+def split_teams(value):
+    """Split an "a vs b" string into (team_a, team_b); team_b is None without a separator"""
+    if " vs " in value:
+        team_a, team_b = value.split(" vs ", 1)
+        return team_a, team_b
+    return value, None
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Match:
+    """One schedule entry, parsed once when it is created.
+
+    Behaves like the JSON list form [date, time, tournament, "a vs b",
+    remarks, bo] for indexing, len() and iteration, so existing positional
+    code keeps working; to_list() gives the list back for saving. Field
+    strings (dates, tournaments, BO, team codes, round names) repeat across a
+    season and are interned, and sort_key
+    is the start time as a UTC timestamp (local wall time converted once).
+    """
+    __slots__ = ("date", "time", "tournament", "team_a", "team_b", "remarks", "bo", "match_id", "sort_key")
+
+    def __init__(self, date="", time="", tournament="", teams="", remarks="", bo="", match_id=""):
+        self.date = _intern(date)
+        self.time = _intern(time)
+        self.tournament = _intern(tournament)
+        team_a, team_b = split_teams(teams)
+        self.team_a = _intern(team_a)
+        self.team_b = _intern(team_b) if team_b is not None else None
+        self.remarks = _intern(remarks)
+        self.bo = _intern(bo)
+        self.match_id = match_id or ""
+        self.sort_key = self._parse_sort_key(date, time)
+
+    @staticmethod
+    def _parse_sort_key(date_str, time_str):
+        year, month, day, hour, minute = parse_match_datetime(date_str, time_str or "00:00")
+        if year != 9999:
+            try:
+                # Naive local wall time -> UTC timestamp
+                return datetime(year, month, day, hour, minute).astimezone(timezone.utc).timestamp()
+            except (ValueError, OverflowError, OSError):
+                pass
+        return UNDATED_SORT_KEY + hour * 3600 + minute * 60
+
+    @classmethod
+    def from_list(cls, row):
+        """Build from the JSON list form (short rows are padded with "")"""
+        if isinstance(row, Match):
+            return row
+        return cls(*(row[i] if i < len(row) else "" for i in range(FIELD_COUNT)))
+
+    def to_list(self):
+        row = [self.date, self.time, self.tournament, self.teams, self.remarks, self.bo]
+        if self.match_id:
+            row.append(self.match_id)
+        return row
+
+    @property
+    def teams(self):
+        """The "a vs b" field as stored"""
+        return self.team_a if self.team_b is None else f"{self.team_a} vs {self.team_b}"
+
+    @property
+    def starts_at(self):
+        """Start time as an aware UTC datetime, or None for undated matches"""
+        if self.sort_key >= UNDATED_SORT_KEY:
+            return None
+        return datetime.fromtimestamp(self.sort_key, timezone.utc)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) or index < 0:
+            return self.to_list()[index]
+        return getattr(self, FIELDS[index])
+
+    def __len__(self):
+        return FIELD_COUNT if self.match_id else EDIT_FIELD_COUNT
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __eq__(self, other):
+        if isinstance(other, (Match, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Match({self.to_list()!r})"
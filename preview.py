@@ -3,41 +3,48 @@ Preview widget for VCT Display Demo
 """
 import os
 import json
+import bisect
+from operator import attrgetter
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QGridLayout, QMessageBox,
-                             QFileDialog)
-from PyQt6.QtCore import Qt, QDate, QRect
-from PyQt6.QtGui import QFont, QColor, QShortcut, QKeySequence, QPixmap, QPainter, QImage
+                             QFileDialog, QCheckBox)
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QFont, QColor, QShortcut, QKeySequence, QPixmap, QPainter
 
 from cards import MatchCard
-from dialogs import MatchEditDialog
-from api_import import show_vlr_import_dialog
 from widgets import SmoothScrollArea
+from backgrounds import get_preview_background, preprocess_background_async
+from config import EXPORT_WORKERS, JPEG_MAX_DIMENSION
+from render import ScheduleLayout
+from storage import (MatchStore, SqliteMatchStore, apply_change, filter_rows, fsync_write, saver,
+                     write_json_rows)
+from models import Match, EDIT_FIELD_COUNT
+from history import History, inverse_change
+
+# dialogs, api_import (urllib/json/re), export and scene_preview are imported
+# on first use to keep them off the startup path
 
 
 class BackgroundContainer(QWidget):
     """Container widget that can display a background image"""
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.background_pixmap = None
+        self.background_path = None
         self._cached_scaled_bg = None
-        self._cached_bg_width = -1
+        self._cached_bg_key = None
     
     def set_background(self, path):
         """Set the background image from path"""
-        if path and os.path.exists(path):
-            self.background_pixmap = QPixmap(path)
-        else:
-            self.background_pixmap = None
+        self.background_path = path if path and os.path.exists(path) else None
         self._cached_scaled_bg = None
-        self._cached_bg_width = -1
+        self._cached_bg_key = None
         self.update()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
         # Invalidate cache when container width changes
         self._cached_scaled_bg = None
-        self._cached_bg_width = -1
+        self._cached_bg_key = None
     
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -48,41 +55,56 @@ class BackgroundContainer(QWidget):
         painter.fillRect(clip_rect, QColor("#f5f5f5"))
         
         # Draw background if set
-        if self.background_pixmap and not self.background_pixmap.isNull():
-            # Cache scaled background to avoid expensive scaling on each repaint
-            if self._cached_scaled_bg is None or self._cached_bg_width != self.width():
-                self._cached_scaled_bg = self.background_pixmap.scaledToWidth(
-                    self.width(), Qt.TransformationMode.SmoothTransformation
-                )
-                self._cached_bg_width = self.width()
+        if self.background_path:
+            # Cache scaled background to avoid expensive scaling on each repaint;
+            # it comes from a preview-size decode kept in the on-disk cache
+            bg_key = (self.width(), self.devicePixelRatioF())
+            if self._cached_scaled_bg is None or self._cached_bg_key != bg_key:
+                image = get_preview_background(self.background_path, self.width(), self.devicePixelRatioF())
+                self._cached_scaled_bg = QPixmap.fromImage(image) if image is not None else None
+                self._cached_bg_key = bg_key
 
             scaled_bg = self._cached_scaled_bg
-            bg_height = scaled_bg.height()
-            
-            # Tile only inside exposed paint region
-            start_y = (clip_rect.top() // bg_height) * bg_height
-            end_y = clip_rect.bottom()
-            y = start_y
-            while y <= end_y:
-                painter.drawPixmap(0, y, scaled_bg)
-                y += bg_height
+            if scaled_bg is not None:
+                bg_height = max(1, round(scaled_bg.deviceIndependentSize().height()))
+                
+                # Tile only inside exposed paint region
+                start_y = (clip_rect.top() // bg_height) * bg_height
+                end_y = clip_rect.bottom()
+                y = start_y
+                while y <= end_y:
+                    painter.drawPixmap(0, y, scaled_bg)
+                    y += bg_height
         
         painter.end()
 
 
 class PreviewWidget(QWidget):
     DATA_FILE = "matches.json"
+    DB_FILE = "matches.db"
     SETTINGS_FILE = "settings.json"
+    CARD_POOL_SIZE = 64  # Max detached cards kept for reuse
     
     def __init__(self, cn_font_family="Microsoft YaHei", en_font_family="Microsoft YaHei"):
         super().__init__()
         self.cn_font_family = cn_font_family
         self.en_font_family = en_font_family
         self.data = []  # Store match data
+        self.store = None  # MatchStore (snapshot + journal) or SqliteMatchStore, see open_store
+        self.load_error = None  # Why stored matches could not be read (None: loaded or nothing stored)
+        self.history = History()  # Undo/redo steps, filled by apply_edit
         self.selected_index = -1  # Currently selected card index
         self.clipboard_data = None  # For copy/paste
         self.cards = []  # Keep track of card widgets
+        self.card_pool = []  # Detached cards kept for reuse by refresh_cards
+        self._stretch_row = -1  # Grid row currently holding the bottom stretch
         self.background_path = None  # Background image path for export
+        self.preview_backend = "widgets"  # "widgets" (QGridLayout) or "scene" (QGraphicsScene)
+        self.export_workers = None  # Threads rasterizing cards during export (None: EXPORT_WORKERS)
+        self.keep_sorted = False  # Keep matches in start-time order on every change
+        self.storage_backend = "json"  # "json" (matches.json + journal) or "sqlite" (matches.db)
+        self.view_from = None  # sqlite only: first date ("Y.M.D") loaded into the preview
+        self.view_to = None  # sqlite only: last date loaded into the preview
         
         # Enable focus for keyboard shortcuts
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
@@ -94,6 +116,10 @@ class PreviewWidget(QWidget):
         self.paste_shortcut.activated.connect(self.paste_match)
         self.delete_shortcut = QShortcut(QKeySequence.StandardKey.Delete, self)
         self.delete_shortcut.activated.connect(self.delete_selected)
+        self.undo_shortcut = QShortcut(QKeySequence.StandardKey.Undo, self)
+        self.undo_shortcut.activated.connect(self.undo)
+        self.redo_shortcut = QShortcut(QKeySequence.StandardKey.Redo, self)
+        self.redo_shortcut.activated.connect(self.redo)
         
         self.main_layout = QVBoxLayout()
         self.setLayout(self.main_layout)
@@ -114,6 +140,10 @@ class PreviewWidget(QWidget):
         self.sort_btn.clicked.connect(self.sort_by_time)
         btn_layout.addWidget(self.sort_btn)
         
+        self.keep_sorted_check = QCheckBox("自动排序")
+        self.keep_sorted_check.setToolTip("添加、编辑、粘贴和导入的比赛自动插入到按时间排序的位置")
+        btn_layout.addWidget(self.keep_sorted_check)
+        
         self.clear_btn = QPushButton("× 清空全部")
         self.clear_btn.clicked.connect(self.clear_all)
         btn_layout.addWidget(self.clear_btn)
@@ -132,22 +162,45 @@ class PreviewWidget(QWidget):
         self.export_btn.clicked.connect(self.export_image)
         btn_layout.addWidget(self.export_btn)
         
-        self.main_layout.addLayout(btn_layout)
+        self.export_data_btn = QPushButton("导出数据")
+        self.export_data_btn.setToolTip("按赛事/队伍筛选，导出为 matches.json 格式")
+        self.export_data_btn.clicked.connect(self.export_data)
+        btn_layout.addWidget(self.export_data_btn)
         
-        # Scroll area for the cards
-        self.scroll_area = SmoothScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.scroll_area.setStyleSheet("QScrollArea { border: none; background-color: #f5f5f5; }")
+        self.main_layout.addLayout(btn_layout)
         
-        # Container widget for the grid
-        self.container = BackgroundContainer()
-        self.grid_layout = QGridLayout(self.container)
-        self.grid_layout.setSpacing(10)
-        self.grid_layout.setContentsMargins(10, 10, 10, 10)
+        # Load settings (background path, preview and storage backends)
+        self.load_settings()
+        self.open_store()
+        self.keep_sorted_check.setChecked(self.keep_sorted)
+        self.keep_sorted_check.toggled.connect(self.set_keep_sorted)
+        
+        if self.preview_backend == "scene":
+            from scene_preview import ScenePreview
+            # Scene graph backend: lightweight card items, only visible ones painted
+            self.scene_view = ScenePreview()
+            self.scene_view.empty_clicked.connect(self.clear_selection)
+            self.container = self.scene_view
+            self.main_layout.addWidget(self.scene_view)
+        else:
+            self.scene_view = None
+            # Scroll area for the cards
+            self.scroll_area = SmoothScrollArea()
+            self.scroll_area.setWidgetResizable(True)
+            self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+            self.scroll_area.setStyleSheet("QScrollArea { border: none; background-color: #f5f5f5; }")
+            
+            # Container widget for the grid
+            self.container = BackgroundContainer()
+            self.grid_layout = QGridLayout(self.container)
+            self.grid_layout.setSpacing(10)
+            self.grid_layout.setContentsMargins(10, 10, 10, 10)
+            
+            self.scroll_area.setWidget(self.container)
+            self.main_layout.addWidget(self.scroll_area)
         
-        self.scroll_area.setWidget(self.container)
-        self.main_layout.addWidget(self.scroll_area)
+        # Update container background preview
+        self.container.set_background(self.background_path)
         
         # Region colors
         self.region_colors = {
@@ -162,9 +215,6 @@ class PreviewWidget(QWidget):
             "national tournament": QColor("#D6B200"),
             "others": QColor("#6b7280")
         }
-        
-        # Load settings (including background path)
-        self.load_settings()
 
     def load_settings(self):
         """Load settings from JSON file"""
@@ -173,20 +223,45 @@ class PreviewWidget(QWidget):
                 with open(self.SETTINGS_FILE, 'r', encoding='utf-8') as f:
                     settings = json.load(f)
                     self.background_path = settings.get('background_path', None)
-                    # Update container background preview
-                    self.container.set_background(self.background_path)
+                    self.preview_backend = settings.get('preview_backend', "widgets")
+                    self.export_workers = settings.get('export_workers', None)
+                    self.keep_sorted = settings.get('keep_sorted', False)
+                    self.storage_backend = settings.get('storage_backend', "json")
+                    self.view_from = settings.get('view_from', None)
+                    self.view_to = settings.get('view_to', None)
         except:
             pass
     
     def save_settings(self):
-        """Save settings to JSON file"""
+        """Save settings to JSON file (written atomically by the background saver)"""
         try:
-            settings = {'background_path': self.background_path}
-            with open(self.SETTINGS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
+            settings = {
+                'background_path': self.background_path,
+                'preview_backend': self.preview_backend,
+                'export_workers': self.export_workers,
+                'keep_sorted': self.keep_sorted,
+                'storage_backend': self.storage_backend,
+                'view_from': self.view_from,
+                'view_to': self.view_to,
+            }
+            payload = json.dumps(settings, ensure_ascii=False, indent=2).encode('utf-8')
+            path = self.SETTINGS_FILE
+            saver.schedule(("settings", path), lambda: fsync_write(path, payload))
         except:
             pass
     
+    def flush_saves(self):
+        """Write every pending journal and settings change now (e.g. on exit)"""
+        saver.flush()
+    
+    def set_font_families(self, cn_font_family, en_font_family):
+        """Switch fonts after a deferred font registration, restyling existing cards"""
+        self.cn_font_family = cn_font_family
+        self.en_font_family = en_font_family
+        self.title.setFont(QFont(cn_font_family, 16, QFont.Weight.Bold))
+        for card in self.cards + self.card_pool:
+            card.set_fonts(cn_font_family, en_font_family)
+    
     def import_background(self):
         """导入背景图片"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -196,131 +271,202 @@ class PreviewWidget(QWidget):
         if file_path:
             self.background_path = file_path
             self.save_settings()
+            # Decode the preview and export sizes once, off the GUI thread
+            preprocess_background_async(self.background_path)
             # Update container background preview
             self.container.set_background(self.background_path)
     
     def import_from_vlr(self):
         """从VLR.gg导入赛程"""
+        from api_import import show_vlr_import_dialog
+        from import_merge import plan_import
         matches = show_vlr_import_dialog(self)
         if matches:
-            self.data.extend(matches)
+            # Re-imports update the matches already in the schedule instead of duplicating them
+            new_matches, updates, skipped = plan_import(self.data, [Match.from_list(row) for row in matches])
+            self.history.begin()
+            if self.keep_sorted:
+                # Updates that change a start time leave their slot and rejoin with the new rows in one merge
+                moved = [(index, match) for index, match in updates if match.sort_key != self.data[index].sort_key]
+                for index, match in updates:
+                    if match.sort_key == self.data[index].sort_key:
+                        self.apply_edit("update", index=index, row=match)
+                if moved:
+                    self.apply_edit("remove", indexes=[index for index, _ in moved])
+                batch = [match for _, match in moved] + new_matches
+                if batch:
+                    self.merge_sorted(batch)
+                    self.selected_index = -1
+            else:
+                for index, match in updates:
+                    self.apply_edit("update", index=index, row=match)
+                if new_matches:
+                    self.apply_edit("insert", index=len(self.data), rows=new_matches)
+            self.history.end()
             self.refresh_cards()
-            self.save_data()
-            QMessageBox.information(self, "成功", f"已导入 {len(matches)} 场比赛")
+            QMessageBox.information(self, "成功", f"已导入 {len(new_matches)} 场比赛，更新 {len(updates)} 场，"
+                                                f"跳过 {skipped} 场已存在的比赛")
+    
+    def export_data(self):
+        """导出比赛数据为 matches.json 格式 (可按赛事/队伍筛选)"""
+        from dialogs import ExportDataDialog
+        dialog = ExportDataDialog(self)
+        if not dialog.exec():
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "导出数据", "matches_export.json", "JSON 文件 (*.json)")
+        if not file_path:
+            return
+        tournament, team = dialog.get_tournament(), dialog.get_team()
+        try:
+            if isinstance(self.store, SqliteMatchStore):
+                # Indexed query over the whole archive, not only the loaded window
+                count = self.store.export_json(file_path, tournament, team)
+            else:
+                rows = filter_rows([match.to_list() for match in self.data], tournament, team)
+                write_json_rows(file_path, rows)
+                count = len(rows)
+        except Exception as e:
+            QMessageBox.warning(self, "导出失败", f"无法写入 {file_path}:\n{e}")
+            return
+        QMessageBox.information(self, "成功", f"已导出 {count} 场比赛到:\n{file_path}")
     
     def export_image(self):
-        """导出为竖向长图片，支持多种分辨率"""
+        """导出为竖向长图片，支持多种分辨率 (可一次导出多个宽度)"""
+        from dialogs import ExportSettingsDialog
+        from export import export_schedule, export_schedule_batch, export_schedule_parts, is_jpeg_path
         if not self.data:
             QMessageBox.warning(self, "提示", "没有比赛数据可导出")
             return
         
-        # Ask for resolution
-        resolutions = ["960px (标清)", "1080px (高清)", "1920px (全高清)", "2880px (2K)"]
-        resolution_values = [960, 1080, 1920, 2880]
-        
-        from PyQt6.QtWidgets import QInputDialog
-        choice, ok = QInputDialog.getItem(self, "选择分辨率", "导出宽度:", resolutions, 1, False)
-        if not ok:
+        # Ask for resolution(s)
+        settings_dialog = ExportSettingsDialog(self)
+        if not settings_dialog.exec():
             return
+        widths = settings_dialog.get_widths()
+        split_mode = settings_dialog.get_split_mode()
         
-        # Get selected width
-        selected_idx = resolutions.index(choice)
-        EXPORT_WIDTH = resolution_values[selected_idx]
-        
-        # Ask for save path
+        # Ask for save path (batch and split exports append _<part>/_<width>p to the name)
+        default_name = f"schedule_{widths[0]}p.png" if len(widths) == 1 and not split_mode else "schedule.png"
         file_path, _ = QFileDialog.getSaveFileName(
-            self, "保存图片", f"schedule_{EXPORT_WIDTH}p.png",
+            self, "保存图片", default_name,
             "图片文件 (*.png);;JPEG文件 (*.jpg)"
         )
         if not file_path:
             return
         
-        # Base dimensions at 1080p (scale factor relative to this)
-        BASE_WIDTH = 1080
-        scale = EXPORT_WIDTH / BASE_WIDTH
-        
-        # Scaled constants for export
-        CARD_WIDTH = int(480 * scale)
-        CARD_HEIGHT = int(100 * scale)
-        CARD_SPACING = int(10 * scale)
-        MARGIN = int(55 * scale)
-        TOP_MARGIN = int(40 * scale)
-        BOTTOM_MARGIN = int(40 * scale)
-        
-        # Calculate number of rows (2 cards per row)
-        num_rows = (len(self.data) + 1) // 2
-        content_height = TOP_MARGIN + num_rows * (CARD_HEIGHT + CARD_SPACING) - CARD_SPACING + BOTTOM_MARGIN
-        
-        # Create the final image with high DPI
-        final_image = QImage(EXPORT_WIDTH, content_height, QImage.Format.Format_ARGB32)
-        final_image.fill(QColor(255, 255, 255))  # White fallback
-        
-        painter = QPainter(final_image)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
-        
-        # Draw background (repeat if too short, clip if too long)
-        if self.background_path and os.path.exists(self.background_path):
-            bg_pixmap = QPixmap(self.background_path)
-            if not bg_pixmap.isNull():
-                # Scale to export width, keeping aspect ratio
-                scaled_bg = bg_pixmap.scaledToWidth(EXPORT_WIDTH, Qt.TransformationMode.SmoothTransformation)
-                bg_height = scaled_bg.height()
-                
-                # Tile vertically if needed
-                y = 0
-                while y < content_height:
-                    painter.drawPixmap(0, y, scaled_bg)
-                    y += bg_height
-        
-        # Render each card at higher resolution
-        for idx, row_data in enumerate(self.data):
-            # Create a temporary card widget with scaled size
-            card = MatchCard(row_data, idx, self.cn_font_family, self.en_font_family, self.region_colors, scale_factor=scale)
-            card.setFixedSize(CARD_WIDTH, CARD_HEIGHT)
-            
-            # Calculate position in grid
-            row = idx // 2
-            col = idx % 2
-            x = MARGIN + col * (CARD_WIDTH + CARD_SPACING)
-            y = TOP_MARGIN + row * (CARD_HEIGHT + CARD_SPACING)
-            
-            # Render card to pixmap at higher resolution
-            card_pixmap = QPixmap(card.size())
-            card_pixmap.fill(Qt.GlobalColor.transparent)
-            card.render(card_pixmap)
-            
-            # Draw card onto final image
-            painter.drawPixmap(x, y, card_pixmap)
-            
-            # Clean up
-            card.deleteLater()
+        workers = self.export_workers or EXPORT_WORKERS
+        if split_mode:
+            manifest_path, outputs = export_schedule_parts(
+                self.data, widths, file_path, split_mode, settings_dialog.get_rows_per_page(),
+                self.cn_font_family, self.en_font_family, self.background_path, self.region_colors,
+                workers=workers)
+            failed = [output["file"] for output in outputs if not output["ok"]]
+            manifest_text = f"清单: {manifest_path}" if manifest_path else "清单文件保存失败"
+            if failed:
+                QMessageBox.warning(self, "失败", "图片保存失败:\n" + "\n".join(failed) + "\n" + manifest_text)
+            elif manifest_path is None:
+                QMessageBox.warning(self, "部分失败", f"已导出 {len(outputs)} 张图片\n{manifest_text}")
+            else:
+                QMessageBox.information(self, "成功", f"已导出 {len(outputs)} 张图片\n{manifest_text}")
+            return
         
-        painter.end()
+        # JPEG cannot be streamed and has a hard height limit
+        if is_jpeg_path(file_path) and ScheduleLayout(len(self.data), max(widths)).height > JPEG_MAX_DIMENSION:
+            QMessageBox.warning(self, "提示", f"JPEG 图片高度不能超过 {JPEG_MAX_DIMENSION}px，请导出为 PNG")
+            return
         
-        # Save the image
-        if final_image.save(file_path):
-            QMessageBox.information(self, "成功", f"图片已保存到:\n{file_path}\n分辨率: {EXPORT_WIDTH}x{content_height}")
+        # Render in strips and stream them into the encoder
+        if len(widths) == 1:
+            size = export_schedule(self.data, widths[0], file_path, self.cn_font_family, self.en_font_family,
+                                   self.background_path, self.region_colors, workers=workers)
+            results = {widths[0]: (file_path, size)}
         else:
-            QMessageBox.warning(self, "失败", "图片保存失败")
+            results = export_schedule_batch(self.data, widths, file_path, self.cn_font_family, self.en_font_family,
+                                            self.background_path, self.region_colors, workers=workers)
+        
+        saved = [f"{path}\n分辨率: {size[0]}x{size[1]}" for path, size in results.values() if size]
+        failed = [path for path, size in results.values() if not size]
+        if failed:
+            QMessageBox.warning(self, "失败", "图片保存失败:\n" + "\n".join(failed))
+        elif saved:
+            QMessageBox.information(self, "成功", "图片已保存到:\n" + "\n".join(saved))
 
+    def open_store(self):
+        """Create the match store for the configured storage backend"""
+        if self.storage_backend == "sqlite":
+            try:
+                self.store = SqliteMatchStore(self.DB_FILE, self.view_from, self.view_to)
+                # First use: bring over the matches.json archive with its journal replayed
+                if not self.store.exists():
+                    rows = MatchStore(self.DATA_FILE).load()
+                    if rows is not None:
+                        self.store.import_rows(rows)
+                return
+            except:
+                pass
+        self.store = MatchStore(self.DATA_FILE)
+    
     def load_data(self):
-        """Load data from JSON file"""
+        """Load data from the JSON snapshot, replaying the change journal"""
+        self.load_error = None
         try:
-            if os.path.exists(self.DATA_FILE):
-                with open(self.DATA_FILE, 'r', encoding='utf-8') as f:
-                    self.data = json.load(f)
+            data = self.store.load()
+            if data is not None:
+                self.data = [Match.from_list(row) for row in data]
                 return True
-        except:
-            pass
+        except Exception as e:
+            self.load_error = e
         return False
     
     def save_data(self):
-        """Save data to JSON file"""
+        """Write all data as a new snapshot (the journal is folded into it)"""
+        if self.store is None:
+            return
         try:
-            with open(self.DATA_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
+            self.store.write_snapshot(self.data)
+        except:
+            pass
+    
+    def apply_edit(self, op, **fields):
+        """Apply one change to self.data, journal it and record its inverse for undo"""
+        self.history.record(*inverse_change(self.data, op, fields))
+        apply_change(self.data, dict(fields, op=op), Match.from_list)
+        self.log_change(op, **fields)
+    
+    def undo(self):
+        """Undo the last change (Ctrl+Z)"""
+        self._replay(self.history.pop_undo(), self.history.push_redo)
+    
+    def redo(self):
+        """Redo the last undone change (Ctrl+Y)"""
+        self._replay(self.history.pop_redo(), self.history.push_undo)
+    
+    def _replay(self, group, push_inverse):
+        """Apply a history group (in reverse order) and push the group that reverts it"""
+        if not group:
+            return
+        inverse = []
+        for op, fields in reversed(group):
+            if op == "keep_sorted":
+                # Setting change recorded by set_keep_sorted, not a change of self.data
+                inverse.append(("keep_sorted", {"enabled": self.keep_sorted}))
+                self._set_keep_sorted_state(fields["enabled"])
+                continue
+            inverse.append(inverse_change(self.data, op, fields))
+            apply_change(self.data, dict(fields, op=op), Match.from_list)
+            self.log_change(op, **fields)
+        push_inverse(inverse)
+        self.selected_index = -1
+        self.refresh_cards()
+    
+    def log_change(self, op, **fields):
+        """Record one mutation of self.data in the journal (see storage.apply_change)"""
+        if self.store is None:
+            return
+        try:
+            self.store.record(op, **fields)
+            if self.store.needs_compaction():
+                self.store.compact_async(self.data)
         except:
             pass
     
@@ -340,25 +486,61 @@ class PreviewWidget(QWidget):
                 ["2026.3.5", "01:00", "masters", "待定 vs 待定", "第三轮 (1-1)", "BO3"],
                 ["2026.3.5", "03:00", "masters", "待定 vs 待定", "第三轮 (1-1)", "BO3"],
             ]
-        self.refresh_cards()
+            self.data = [Match.from_list(row) for row in self.data]
+            if self.load_error is None:
+                # Nothing stored yet; journal records need a snapshot to apply to
+                self.save_data()
+            else:
+                self.handle_load_error()
+        if self.keep_sorted and not self.is_sorted():
+            self.sort_by_time()
+        else:
+            self.refresh_cards()
+        # Nothing loaded at startup is undoable
+        self.history.clear()
+
+    def handle_load_error(self):
+        """Back up unreadable saved matches before the sample data may replace them"""
+        try:
+            copies = self.store.backup()
+        except Exception as e:
+            # Without a copy nothing is written over the files; edits are not saved
+            QMessageBox.warning(self, "加载失败",
+                                f"无法读取已保存的赛程:\n{self.load_error}\n\n"
+                                f"备份失败 ({e})，原文件保持不变，本次修改不会保存。")
+            self.store = None  # Detached: save_data and log_change write nothing
+            return
+        QMessageBox.warning(self, "加载失败",
+                            f"无法读取已保存的赛程:\n{self.load_error}\n\n"
+                            "已载入示例赛程，原文件已备份到:\n" + "\n".join(copies))
+        self.save_data()
 
     def add_match(self):
         """Add a new match and open edit dialog"""
+        from dialogs import MatchEditDialog
         new_data = ["", "", "pacific", "", "", "BO3"]
         dialog = MatchEditDialog(self, new_data)
         if dialog.exec():
-            self.data.append(dialog.get_data())
+            match = Match.from_list(dialog.get_data())
+            index = self.sorted_index(match) if self.keep_sorted else len(self.data)
+            self.apply_edit("insert", index=index, rows=[match])
             self.refresh_cards()
-            self.save_data()
 
     def edit_match(self, index):
         """Edit match at given index"""
+        from dialogs import MatchEditDialog
         if 0 <= index < len(self.data):
             dialog = MatchEditDialog(self, self.data[index])
             if dialog.exec():
-                self.data[index] = dialog.get_data()
+                # The update and the re-sort undo as one step
+                self.history.begin()
+                match = Match.from_list(dialog.get_data())
+                match.match_id = self.data[index].match_id  # The dialog does not show the VLR id
+                self.apply_edit("update", index=index, row=match)
+                if self.keep_sorted:
+                    self.resort_row(index)
+                self.history.end()
                 self.refresh_cards()
-                self.save_data()
 
     def delete_match(self, index):
         """Delete match at given index"""
@@ -366,39 +548,112 @@ class PreviewWidget(QWidget):
             reply = QMessageBox.question(self, "确认删除", "确定要删除这场比赛吗？",
                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             if reply == QMessageBox.StandardButton.Yes:
-                del self.data[index]
+                self.apply_edit("delete", index=index)
                 self.refresh_cards()
-                self.save_data()
 
     def refresh_cards(self):
-        """Refresh the card display"""
-        # Clear existing cards
-        self.cards = []
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Add match cards in 2-column layout
+        """Reconcile the card display with self.data.
+        
+        Cards are matched to rows by a stable key (the row object itself), so
+        unchanged rows keep their card untouched, edited rows update their
+        card in place, and only cards whose position changed are moved.
+        Cards for removed rows go to a small pool for reuse.
+        """
+        old_cards = self.cards
+        by_key = {id(card.match_data): card for card in old_cards}
+        new_cards = [by_key.pop(id(row_data), None) for row_data in self.data]
+        
+        # Rows without a card (new or replaced rows) take leftover cards first,
+        # then pooled ones, so editing a row updates its existing card
+        matched = set(id(card) for card in new_cards if card is not None)
+        spare = [card for card in old_cards if id(card) not in matched]
+        spare.reverse()
         for idx, row_data in enumerate(self.data):
+            card = new_cards[idx]
+            if card is None:
+                card = spare.pop() if spare else self._acquire_card(row_data, idx)
+                new_cards[idx] = card
+            card.set_match(row_data)  # No-op unless the fields changed
+            card.set_index(idx)
+            if card.selected and idx != self.selected_index:
+                card.set_selected(False)
+        
+        self.cards = new_cards
+        if self.scene_view is not None:
+            self.scene_view.set_cards(self.cards)
+            for card in spare:
+                self._release_card(card)
+            self._restore_selection()
+            return
+        
+        # Re-place only the cards from the first position that changed
+        first_moved = len(old_cards)
+        for idx, (old_card, new_card) in enumerate(zip(old_cards, new_cards)):
+            if old_card is not new_card:
+                first_moved = idx
+                break
+        for card in old_cards[first_moved:]:
+            self.grid_layout.removeWidget(card)
+        for card in spare:
+            self._release_card(card)
+        for idx in range(first_moved, len(new_cards)):
+            card = new_cards[idx]
+            self.grid_layout.addWidget(card, idx // 2, idx % 2, Qt.AlignmentFlag.AlignTop)
+            card.show()
+        
+        self._restore_selection()
+        
+        # Keep the stretch just below the last row
+        stretch_row = len(self.data) // 2 + 1
+        if stretch_row != self._stretch_row:
+            if self._stretch_row >= 0:
+                self.grid_layout.setRowStretch(self._stretch_row, 0)
+            self.grid_layout.setRowStretch(stretch_row, 1)
+            self._stretch_row = stretch_row
+    
+    def _acquire_card(self, row_data, idx):
+        """Take a card from the pool, or create and wire a new one"""
+        if self.card_pool:
+            return self.card_pool.pop()
+        if self.scene_view is not None:
+            from scene_preview import MatchCardItem
+            card = MatchCardItem(row_data, idx, self.cn_font_family, self.en_font_family, self.region_colors)
+        else:
             card = MatchCard(row_data, idx, self.cn_font_family, self.en_font_family, self.region_colors)
-            card.card_double_clicked.connect(self.edit_match)
-            card.card_clicked.connect(self.select_card)
-            card.card_copy.connect(self.copy_match)
-            card.card_deleted.connect(self.delete_match)
-            self.cards.append(card)
-            row = idx // 2
-            col = idx % 2
-            self.grid_layout.addWidget(card, row, col, Qt.AlignmentFlag.AlignTop)
-        
-        # Restore selection if valid
+        self._connect_card(card)
+        return card
+    
+    def _release_card(self, card):
+        """Detach a card that is no longer shown and keep it for reuse"""
+        if card.selected:
+            card.set_selected(False)
+        if self.scene_view is None:
+            self.grid_layout.removeWidget(card)
+            card.hide()
+        if len(self.card_pool) < self.CARD_POOL_SIZE:
+            self.card_pool.append(card)
+        elif self.scene_view is None:
+            card.deleteLater()
+    
+    def _connect_card(self, card):
+        """Wire a card widget or scene item to the editing actions"""
+        card.card_double_clicked.connect(self.edit_match)
+        card.card_clicked.connect(self.select_card)
+        card.card_copy.connect(self.copy_match)
+        card.card_deleted.connect(self.delete_match)
+    
+    def _restore_selection(self):
+        """Restore selection if valid"""
         if 0 <= self.selected_index < len(self.cards):
             self.cards[self.selected_index].set_selected(True)
         else:
             self.selected_index = -1
-        
-        # Add stretch at the bottom
-        self.grid_layout.setRowStretch(len(self.data) // 2 + 1, 1)
+    
+    def clear_selection(self):
+        """Deselect the currently selected card"""
+        if 0 <= self.selected_index < len(self.cards):
+            self.cards[self.selected_index].set_selected(False)
+        self.selected_index = -1
     
     def select_card(self, index):
         """Select a card by index"""
@@ -415,7 +670,7 @@ class PreviewWidget(QWidget):
     def copy_match(self, index):
         """Copy match data at index to clipboard"""
         if 0 <= index < len(self.data):
-            self.clipboard_data = list(self.data[index])  # Copy the data
+            self.clipboard_data = list(self.data[index])[:EDIT_FIELD_COUNT]  # Copy the data (not the VLR id)
     
     def copy_selected(self):
         """Copy currently selected match"""
@@ -425,12 +680,15 @@ class PreviewWidget(QWidget):
     def paste_match(self):
         """Paste copied match data"""
         if self.clipboard_data:
-            # Insert after selected, or at end
-            insert_pos = self.selected_index + 1 if self.selected_index >= 0 else len(self.data)
-            self.data.insert(insert_pos, list(self.clipboard_data))
+            # Insert after selected, or at end (at its time slot when kept sorted)
+            match = Match.from_list(self.clipboard_data)
+            if self.keep_sorted:
+                insert_pos = self.sorted_index(match)
+            else:
+                insert_pos = self.selected_index + 1 if self.selected_index >= 0 else len(self.data)
+            self.apply_edit("insert", index=insert_pos, rows=[match])
             self.selected_index = insert_pos
             self.refresh_cards()
-            self.save_data()
     
     def delete_selected(self):
         """Delete currently selected match"""
@@ -439,35 +697,73 @@ class PreviewWidget(QWidget):
     
     def sort_by_time(self):
         """Sort matches by date and time"""
-        def parse_datetime(match_data):
-            date_str = match_data[0] if len(match_data) > 0 else ""
-            time_str = match_data[1] if len(match_data) > 1 else "00:00"
-            
-            # Parse date (Y.M.D or M.D format)
-            try:
-                parts = date_str.split('.')
-                if len(parts) == 3:
-                    year, month, day = map(int, parts)
-                elif len(parts) == 2:
-                    month, day = map(int, parts)
-                    year = QDate.currentDate().year()
-                else:
-                    year, month, day = 9999, 12, 31
-            except:
-                year, month, day = 9999, 12, 31
-            
-            # Parse time (HH:MM format)
-            try:
-                hour, minute = map(int, time_str.split(':'))
-            except:
-                hour, minute = 0, 0
-            
-            return (year, month, day, hour, minute)
-        
-        self.data.sort(key=parse_datetime)
+        # Start times were parsed once when each Match was created;
+        # the journal records the permutation rather than the rows
+        order = sorted(range(len(self.data)), key=lambda i: self.data[i].sort_key)
+        self.apply_edit("reorder", order=order)
         self.selected_index = -1
         self.refresh_cards()
-        self.save_data()
+    
+    def set_keep_sorted(self, enabled):
+        """Turn the always-sorted mode on or off (sorting once when turned on)"""
+        # The switch and its sort undo as one step, so undo never leaves the mode on over unsorted rows
+        self.history.begin()
+        self.history.record("keep_sorted", {"enabled": not enabled})
+        self._set_keep_sorted_state(enabled)
+        if enabled and not self.is_sorted():
+            self.sort_by_time()
+        self.history.end()
+    
+    def _set_keep_sorted_state(self, enabled):
+        """Set the mode and its checkbox without recording history"""
+        self.keep_sorted = enabled
+        self.keep_sorted_check.blockSignals(True)
+        self.keep_sorted_check.setChecked(enabled)
+        self.keep_sorted_check.blockSignals(False)
+        self.save_settings()
+    
+    def is_sorted(self):
+        """True if self.data is in start-time order"""
+        return all(a.sort_key <= b.sort_key for a, b in zip(self.data, self.data[1:]))
+    
+    def sorted_index(self, match):
+        """Insertion index keeping start-time order (after equal start times)"""
+        return bisect.bisect_right(self.data, match.sort_key, key=attrgetter("sort_key"))
+    
+    def resort_row(self, index):
+        """Move an edited row to its sorted position if its start time changed order"""
+        match = self.data[index]
+        if ((index == 0 or self.data[index - 1].sort_key <= match.sort_key)
+                and (index == len(self.data) - 1 or match.sort_key <= self.data[index + 1].sort_key)):
+            return
+        # The other rows are still sorted, so bisect on the side the row moves to
+        if index > 0 and match.sort_key < self.data[index - 1].sort_key:
+            new_index = bisect.bisect_right(self.data, match.sort_key, 0, index, key=attrgetter("sort_key"))
+        else:
+            new_index = bisect.bisect_right(self.data, match.sort_key, index + 1, len(self.data),
+                                            key=attrgetter("sort_key")) - 1
+        self.apply_edit("move", **{"from": index, "to": new_index})
+        if self.selected_index == index:
+            self.selected_index = new_index
+        elif self.selected_index >= 0:
+            # Rows between the old and new slot shifted by one
+            if index < self.selected_index <= new_index:
+                self.selected_index -= 1
+            elif new_index <= self.selected_index < index:
+                self.selected_index += 1
+    
+    def merge_sorted(self, matches):
+        """Merge a batch into the sorted schedule in O(n + k) as one journaled change"""
+        batch = sorted(matches, key=attrgetter("sort_key"))
+        indexes = []
+        i = 0
+        for match in batch:
+            # Existing rows with an equal start time stay first (as with bisect_right)
+            while i < len(self.data) and self.data[i].sort_key <= match.sort_key:
+                i += 1
+            # Final index: the existing rows before it plus the batch rows already placed
+            indexes.append(i + len(indexes))
+        self.apply_edit("merge", indexes=indexes, rows=batch)
     
     def clear_all(self):
         """清空所有比赛数据"""
@@ -476,10 +772,9 @@ class PreviewWidget(QWidget):
         reply = QMessageBox.question(self, "确认清空", "确定要清空所有比赛吗？",
                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            self.data = []
+            self.apply_edit("clear")
             self.selected_index = -1
             self.refresh_cards()
-            self.save_data()
     
     def mousePressEvent(self, event):
         """Deselect when clicking on empty space"""
@@ -487,9 +782,7 @@ class PreviewWidget(QWidget):
         child = self.childAt(event.pos())
         if child is None or not isinstance(child, MatchCard):
             # Deselect
-            if 0 <= self.selected_index < len(self.cards):
-                self.cards[self.selected_index].set_selected(False)
-            self.selected_index = -1
+            self.clear_selection()
         super().mousePressEvent(event)
 
     def get_data(self):
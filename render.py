@@ -0,0 +1,421 @@
+"""
+Widget-free QPainter rendering of match cards and schedules for VCT Display Demo
+"""
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import Qt, QRect, QRectF
+from PyQt6.QtGui import QFont, QFontMetrics, QColor, QImage, QPainter, QPen, QPainterPath
+
+from config import REGION_COLORS
+from backgrounds import get_background
+from image_cache import image_cache, get_image
+from models import Match, split_teams
+from utils import get_card_background_path, get_tournament_icon_path, get_team_icon_path
+
+# Default font family when the bundled fonts are not registered
+DEFAULT_FONT_FAMILY = "Microsoft YaHei"
+
+# Export layout at the 1080px base width (everything scales from here)
+BASE_WIDTH = 1080
+BASE_CARD_WIDTH = 480
+BASE_CARD_HEIGHT = 100
+BASE_CARD_SPACING = 10
+BASE_MARGIN = 55
+BASE_TOP_MARGIN = 40
+BASE_BOTTOM_MARGIN = 40
+COLUMNS = 2
+
+FALLBACK_COLOR = "#4BACC6"
+SELECTED_COLOR = "#0ea5e9"
+REMARKS_COLOR = "#666666"
+
+
+def parse_match_fields(match_data):
+    """Split a match row into (date, time, tournament, team_a, team_b, remarks, bo)"""
+    if isinstance(match_data, Match):
+        # Already parsed: no string splitting on every repaint
+        return (match_data.date, match_data.time, match_data.tournament, match_data.team_a,
+                match_data.team_b or "", match_data.remarks, match_data.bo)
+    date_val = match_data[0] if len(match_data) > 0 else ""
+    time_val = match_data[1] if len(match_data) > 1 else ""
+    tournament_val = match_data[2] if len(match_data) > 2 else ""
+    match_val = match_data[3] if len(match_data) > 3 else ""
+    remarks_val = match_data[4] if len(match_data) > 4 else ""
+    bo_val = match_data[5] if len(match_data) > 5 else ""
+
+    team_a, team_b = split_teams(match_val)
+    return date_val, time_val, tournament_val, team_a, team_b or "", remarks_val, bo_val
+
+
+def region_color(tournament, region_colors=None):
+    """Return the QColor used for a tournament's text and border"""
+    colors = region_colors if region_colors is not None else REGION_COLORS
+    return QColor(colors.get(tournament.strip().lower(), FALLBACK_COLOR))
+
+
+def load_icon(path, size):
+    """Load an image scaled to fit a size x size box, or None if unavailable"""
+    return get_image(path, size, size, Qt.AspectRatioMode.KeepAspectRatio)
+
+
+def load_card_background(path, width, height):
+    """Load a card background scaled to cover width x height, or None"""
+    return get_image(path, width, height, Qt.AspectRatioMode.KeepAspectRatioByExpanding)
+
+
+class ScheduleLayout:
+    """Two-column card grid geometry for an export of a given width"""
+    def __init__(self, count, width):
+        self.count = count
+        self.width = width
+        self.scale = width / BASE_WIDTH
+        self.card_width = int(BASE_CARD_WIDTH * self.scale)
+        self.card_height = int(BASE_CARD_HEIGHT * self.scale)
+        self.card_spacing = int(BASE_CARD_SPACING * self.scale)
+        self.margin = int(BASE_MARGIN * self.scale)
+        self.top_margin = int(BASE_TOP_MARGIN * self.scale)
+        self.bottom_margin = int(BASE_BOTTOM_MARGIN * self.scale)
+        self.rows = (count + COLUMNS - 1) // COLUMNS
+        self.height = (self.top_margin + self.rows * (self.card_height + self.card_spacing)
+                       - self.card_spacing + self.bottom_margin)
+
+    def cards_between(self, top, bottom):
+        """Range of card indices whose row overlaps image rows [top, bottom)"""
+        pitch = self.card_height + self.card_spacing
+        first_row = max(0, (top - self.top_margin) // pitch)
+        last_row = min(self.rows - 1, (bottom - 1 - self.top_margin) // pitch)
+        if last_row < first_row:
+            return range(0)
+        return range(first_row * COLUMNS, min(self.count, (last_row + 1) * COLUMNS))
+
+    def card_rect(self, index):
+        """Rectangle of the card at index in image coordinates"""
+        row = index // COLUMNS
+        col = index % COLUMNS
+        x = self.margin + col * (self.card_width + self.card_spacing)
+        y = self.top_margin + row * (self.card_height + self.card_spacing)
+        return QRect(x, y, self.card_width, self.card_height)
+
+
+def paint_card_chrome(painter, rect, tournament, border_color, scale=1.0, selected=False):
+    """Paint the rounded white base, blended tournament background and border"""
+    sf = scale
+    border_adj = int(2 * sf)
+    corner_radius = int(8 * sf)
+    inner = rect.adjusted(border_adj, border_adj, -border_adj, -border_adj)
+    dpr = painter.device().devicePixelRatio()
+
+    clip_path = QPainterPath()
+    clip_path.addRoundedRect(inner.x(), inner.y(), inner.width(), inner.height(), corner_radius, corner_radius)
+
+    painter.save()
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(QColor(255, 255, 255))
+    painter.drawRoundedRect(inner, corner_radius, corner_radius)
+
+    # Background image at 30% opacity, center-cropped inside the rounded rect
+    background = load_card_background(get_card_background_path(tournament),
+                                      round(inner.width() * dpr), round(inner.height() * dpr))
+    if background is not None:
+        width = background.width() / dpr
+        height = background.height() / dpr
+        x_offset = (width - inner.width()) / 2
+        y_offset = (height - inner.height()) / 2
+        painter.setOpacity(0.3)
+        painter.setClipPath(clip_path)
+        painter.drawImage(QRectF(inner.x() - x_offset, inner.y() - y_offset, width, height), background)
+        painter.setOpacity(1.0)
+        painter.setClipping(False)
+
+    if selected:
+        pen = QPen(QColor(SELECTED_COLOR))
+        pen.setWidth(int(4 * sf))
+    else:
+        pen = QPen(QColor(border_color))
+        pen.setWidth(int(2 * sf))
+    painter.setPen(pen)
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+    painter.drawRoundedRect(inner, corner_radius, corner_radius)
+    painter.restore()
+
+
+def render_card_chrome(tournament, border_color, width, height, scale=1.0, selected=False, dpr=1.0):
+    """Bake the card chrome into a transparent QImage of width x height logical pixels"""
+    image = QImage(round(width * dpr), round(height * dpr), QImage.Format.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(dpr)
+    image.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+    paint_card_chrome(painter, QRect(0, 0, width, height), tournament, border_color, scale, selected)
+    painter.end()
+    return image
+
+
+def card_chrome_key(tournament, border_color, width, height, scale, selected, dpr):
+    """Cache key for baked chrome; size, state and asset path all participate"""
+    return ("chrome", get_card_background_path(tournament), QColor(border_color).name(),
+            width, height, scale, selected, dpr)
+
+
+def get_card_chrome(tournament, border_color, width, height, scale=1.0, selected=False, dpr=1.0):
+    """Return the baked chrome QImage from the shared cache, rendering it on first use"""
+    key = card_chrome_key(tournament, border_color, width, height, scale, selected, dpr)
+    return image_cache.cached(key, lambda: render_card_chrome(
+        tournament, border_color, width, height, scale, selected, dpr))
+
+
+def paint_card_content(painter, rect, match_data, cn_font_family, en_font_family,
+                       region_colors=None, scale=1.0):
+    """Paint the text and icons of a card, mirroring the MatchCard layout"""
+    sf = scale
+    font_size = int(12 * sf)
+    remarks_font_size = int(10 * sf)
+    icon_size = int(24 * sf)
+    team_icon_size = int(32 * sf)
+    margin_h = int(10 * sf)
+    margin_v = int(8 * sf)
+    spacing = int(6 * sf)
+    match_height = int(40 * sf)
+    vs_width = int(40 * sf)
+    top_spacing = int(10 * sf)
+    icon_spacing = int(4 * sf)
+
+    date_val, time_val, tournament_val, team_a, team_b, remarks_val, bo_val = parse_match_fields(match_data)
+    color = region_color(tournament_val, region_colors)
+
+    en_font = QFont(en_font_family, font_size, QFont.Weight.Bold)
+    remarks_font = QFont(cn_font_family, remarks_font_size, QFont.Weight.Bold)
+    en_metrics = QFontMetrics(en_font, painter.device())
+    remarks_metrics = QFontMetrics(remarks_font, painter.device())
+
+    inner = rect.adjusted(margin_h, margin_v, -margin_h, -margin_v)
+    has_remarks = bool(remarks_val.strip())
+
+    # Stack rows the way the card's QVBoxLayout does, centered in the spare height
+    top_height = max(icon_size, en_metrics.height())
+    total_height = top_height + spacing + match_height
+    if has_remarks:
+        total_height += spacing + remarks_metrics.height()
+    y = inner.top() + max(0, (inner.height() - total_height) // 2)
+    top_rect = QRect(inner.left(), y, inner.width(), top_height)
+    y += top_height + spacing
+    match_rect = QRect(inner.left(), y, inner.width(), match_height)
+    y += match_height + spacing
+    remarks_rect = QRect(inner.left(), y, inner.width(), remarks_metrics.height())
+
+    painter.save()
+    painter.setPen(color)
+    painter.setFont(en_font)
+    left_align = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+    right_align = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+    # Top row: date, time, BO on the left; tournament icon and name on the right
+    x = top_rect.left()
+    for text in (date_val, time_val, bo_val):
+        if not text:
+            continue
+        advance = en_metrics.horizontalAdvance(text)
+        painter.drawText(QRect(x, top_rect.top(), advance, top_height), left_align, text)
+        x += advance + top_spacing
+
+    tournament_text = tournament_val.upper()
+    right = top_rect.right() + 1
+    painter.drawText(QRect(top_rect.left(), top_rect.top(), top_rect.width(), top_height), right_align, tournament_text)
+    right -= en_metrics.horizontalAdvance(tournament_text) + icon_spacing
+    icon = load_icon(get_tournament_icon_path(tournament_val), icon_size)
+    if icon is not None:
+        painter.drawImage(right - icon.width(), top_rect.top() + (top_height - icon.height()) // 2, icon)
+
+    # Middle row: team A left aligned, "vs" centered, team B right aligned
+    side_width = (match_rect.width() - vs_width) // 2
+    team_a_rect = QRect(match_rect.left(), match_rect.top(), side_width, match_height)
+    vs_rect = QRect(team_a_rect.right() + 1, match_rect.top(), vs_width, match_height)
+    team_b_rect = QRect(vs_rect.right() + 1, match_rect.top(), match_rect.right() - vs_rect.right(), match_height)
+
+    x = team_a_rect.left()
+    icon_a = load_icon(get_team_icon_path(team_a), team_icon_size)
+    if icon_a is not None:
+        painter.drawImage(x, team_a_rect.top() + (match_height - icon_a.height()) // 2, icon_a)
+        x += team_icon_size + icon_spacing
+    painter.drawText(QRect(x, team_a_rect.top(), team_a_rect.right() - x + 1, match_height), left_align, team_a.upper())
+
+    painter.drawText(vs_rect, Qt.AlignmentFlag.AlignCenter, "vs")
+
+    right = team_b_rect.right() + 1
+    icon_b = load_icon(get_team_icon_path(team_b), team_icon_size)
+    if icon_b is not None:
+        box_left = right - team_icon_size
+        painter.drawImage(box_left, team_b_rect.top() + (match_height - icon_b.height()) // 2, icon_b)
+        right = box_left - icon_spacing
+    painter.drawText(QRect(team_b_rect.left(), team_b_rect.top(), right - team_b_rect.left(), match_height), right_align, team_b.upper())
+
+    # Bottom row: remarks
+    if has_remarks:
+        painter.setPen(QColor(REMARKS_COLOR))
+        painter.setFont(remarks_font)
+        painter.drawText(remarks_rect, Qt.AlignmentFlag.AlignCenter, remarks_val)
+
+    painter.restore()
+
+
+def paint_card(painter, rect, match_data, cn_font_family, en_font_family,
+               region_colors=None, scale=1.0, selected=False):
+    """Paint a complete match card into rect"""
+    tournament_val = match_data[2] if len(match_data) > 2 else ""
+    color = region_color(tournament_val, region_colors)
+    chrome = get_card_chrome(tournament_val, color.name(), rect.width(), rect.height(), scale, selected)
+    painter.drawImage(rect.topLeft(), chrome)
+    paint_card_content(painter, rect, match_data, cn_font_family, en_font_family, region_colors, scale)
+
+
+def paint_background(painter, background, top, bottom):
+    """Tile a background image (already scaled to width) over rows [top, bottom)"""
+    if background is None or background.isNull():
+        return
+    bg_height = background.height()
+    y = (top // bg_height) * bg_height
+    while y < bottom:
+        painter.drawImage(0, y, background)
+        y += bg_height
+
+
+def load_background(path, width):
+    """Load the schedule background scaled to the export width, or None"""
+    return get_background(path, width)
+
+
+def rasterize_card(match_data, width, height, cn_font_family=DEFAULT_FONT_FAMILY,
+                   en_font_family=DEFAULT_FONT_FAMILY, region_colors=None, scale=1.0):
+    """Paint one card into its own transparent QImage; safe to call off the GUI thread"""
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+    painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+    paint_card(painter, QRect(0, 0, width, height), match_data, cn_font_family, en_font_family,
+               region_colors, scale)
+    painter.end()
+    return image
+
+
+class CardRasterizer:
+    """Rasterizes the cards of a layout on a thread pool, handed back in index order.
+
+    Cards are submitted a bounded window ahead of the one being composited, so
+    at most a few images per worker are alive at any time.
+    """
+    def __init__(self, matches, layout, cn_font_family=DEFAULT_FONT_FAMILY,
+                 en_font_family=DEFAULT_FONT_FAMILY, region_colors=None, workers=1):
+        self.matches = matches
+        self.layout = layout
+        self.cn_font_family = cn_font_family
+        self.en_font_family = en_font_family
+        self.region_colors = region_colors
+        self.ahead = max(1, workers) * 4
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self._futures = {}
+        self._submitted = 0
+
+    def card(self, index):
+        """Return the rasterized image of card index, waiting for it if needed"""
+        end = min(self.layout.count, index + self.ahead + 1)
+        while self._submitted < end:
+            idx = self._submitted
+            self._futures[idx] = self._executor.submit(
+                rasterize_card, self.matches[idx], self.layout.card_width, self.layout.card_height,
+                self.cn_font_family, self.en_font_family, self.region_colors, self.layout.scale)
+            self._submitted += 1
+        return self._futures[index].result()
+
+    def release_before(self, index):
+        """Drop finished images of cards before index"""
+        for idx in [idx for idx in self._futures if idx < index]:
+            del self._futures[idx]
+
+    def close(self):
+        """Stop the workers, discarding anything not yet started"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._futures.clear()
+
+
+def paint_schedule_region(painter, layout, matches, background, top, bottom,
+                          cn_font_family=DEFAULT_FONT_FAMILY, en_font_family=DEFAULT_FONT_FAMILY,
+                          region_colors=None, rasterizer=None):
+    """Paint image rows [top, bottom) of the schedule in image coordinates.
+
+    With a rasterizer, cards are blitted from its pre-rendered images instead
+    of being painted on this thread.
+    """
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+    painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+
+    # Background repeats if too short, clips if too long
+    paint_background(painter, background, top, bottom)
+
+    for idx in layout.cards_between(top, bottom):
+        rect = layout.card_rect(idx)
+        if rasterizer is not None:
+            painter.drawImage(rect.topLeft(), rasterizer.card(idx))
+        else:
+            paint_card(painter, rect, matches[idx], cn_font_family, en_font_family,
+                       region_colors, layout.scale)
+
+
+def render_schedule(matches, width, cn_font_family=DEFAULT_FONT_FAMILY, en_font_family=DEFAULT_FONT_FAMILY,
+                    background_path=None, region_colors=None, workers=1):
+    """Render the two-column schedule of matches into a new QImage of the given width.
+
+    Requires a QGuiApplication instance for font access, but creates no widgets.
+    With workers > 1, cards are rasterized in parallel and composited in order.
+    """
+    layout = ScheduleLayout(len(matches), width)
+    image = QImage(width, layout.height, QImage.Format.Format_ARGB32)
+    image.fill(QColor(255, 255, 255))  # White fallback
+
+    rasterizer = None
+    if workers > 1:
+        rasterizer = CardRasterizer(matches, layout, cn_font_family, en_font_family, region_colors, workers)
+    painter = QPainter(image)
+    try:
+        paint_schedule_region(painter, layout, matches, load_background(background_path, width),
+                              0, layout.height, cn_font_family, en_font_family, region_colors, rasterizer)
+    finally:
+        painter.end()
+        if rasterizer is not None:
+            rasterizer.close()
+    return image
+
+
+def render_schedule_strips(matches, width, strip_height, cn_font_family=DEFAULT_FONT_FAMILY,
+                           en_font_family=DEFAULT_FONT_FAMILY, background_path=None, region_colors=None,
+                           workers=1):
+    """Yield (top, QImage) horizontal strips of at most strip_height rows, top to bottom.
+
+    Only one strip is alive at a time, so memory stays bounded however many
+    matches the schedule holds. With workers > 1, cards are rasterized on a
+    thread pool and composited into the strips in order on the calling thread.
+    """
+    layout = ScheduleLayout(len(matches), width)
+    background = load_background(background_path, width)
+    rasterizer = None
+    if workers > 1:
+        rasterizer = CardRasterizer(matches, layout, cn_font_family, en_font_family, region_colors, workers)
+    try:
+        for top in range(0, layout.height, strip_height):
+            height = min(strip_height, layout.height - top)
+            strip = QImage(width, height, QImage.Format.Format_RGB32)
+            strip.fill(QColor(255, 255, 255))  # White fallback
+
+            painter = QPainter(strip)
+            painter.translate(0, -top)
+            paint_schedule_region(painter, layout, matches, background, top, top + height,
+                                  cn_font_family, en_font_family, region_colors, rasterizer)
+            painter.end()
+            if rasterizer is not None:
+                rasterizer.release_before(layout.cards_between(top + height, top + height + 1).start)
+            yield top, strip
+    finally:
+        if rasterizer is not None:
+            rasterizer.close()
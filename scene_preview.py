@@ -0,0 +1,194 @@
+"""
+QGraphicsScene-based preview backend for VCT Display Demo
+"""
+from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsObject, QGraphicsItem, QFrame
+from PyQt6.QtCore import Qt, QRectF, QRect, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QCursor, QPixmap
+
+from cards import create_card_menu
+from backgrounds import get_preview_background
+from render import get_card_chrome, paint_card_content, region_color
+from widgets import _SmoothScrollMixin
+
+# Preview grid geometry (matches the QGridLayout used by the widget backend)
+GRID_MARGIN = 10
+GRID_SPACING = 10
+CARD_HEIGHT = 100
+COLUMNS = 2
+
+
+class MatchCardItem(QGraphicsObject):
+    """Lightweight scene item painting one match card; same signals as MatchCard"""
+    card_double_clicked = pyqtSignal(int)  # Emits card index
+    card_clicked = pyqtSignal(int)  # Emits card index for selection
+    card_deleted = pyqtSignal(int)  # Emits card index for deletion
+    card_copy = pyqtSignal(int)  # Emits card index for copy
+
+    def __init__(self, match_data, card_index, cn_font_family, en_font_family, region_colors):
+        super().__init__()
+        self.card_index = card_index
+        self.cn_font_family = cn_font_family
+        self.en_font_family = en_font_family
+        self.region_colors = region_colors
+        self.match_data = None
+        self.rendered_data = None  # Snapshot of the fields currently displayed
+        self.selected = False
+        self._width = 0
+
+        # Painted once into a device-space pixmap, re-rasterized only on update()
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.setAcceptedMouseButtons(Qt.MouseButton.LeftButton | Qt.MouseButton.RightButton)
+        self.set_match(match_data)
+
+    def set_match(self, match_data):
+        """Show match_data on this card, repainting only if the fields changed"""
+        self.match_data = match_data
+        snapshot = tuple(match_data)
+        if snapshot == self.rendered_data:
+            return
+        self.rendered_data = snapshot
+        self.tournament = match_data[2] if len(match_data) > 2 else ""
+        self.border_color = region_color(self.tournament, self.region_colors).name()
+        self.update()
+
+    def set_index(self, card_index):
+        """Update the index emitted by this card's signals"""
+        self.card_index = card_index
+
+    def set_fonts(self, cn_font_family, en_font_family):
+        """Repaint with new font families"""
+        self.cn_font_family = cn_font_family
+        self.en_font_family = en_font_family
+        self.update()
+
+    def set_width(self, width):
+        """Resize the card horizontally (height is fixed)"""
+        if width != self._width:
+            self.prepareGeometryChange()
+            self._width = width
+
+    def boundingRect(self):
+        return QRectF(0, 0, self._width, CARD_HEIGHT)
+
+    def paint(self, painter, option, widget=None):
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        rect = QRect(0, 0, self._width, CARD_HEIGHT)
+        dpr = painter.device().devicePixelRatio()
+        chrome = get_card_chrome(self.tournament, self.border_color, self._width, CARD_HEIGHT,
+                                 selected=self.selected, dpr=dpr)
+        painter.drawImage(0, 0, chrome)
+        paint_card_content(painter, rect, self.match_data, self.cn_font_family, self.en_font_family,
+                           self.region_colors)
+
+    def set_selected(self, selected):
+        """Set selection state"""
+        self.selected = selected
+        self.update()
+
+    def contextMenuEvent(self, event):
+        """Show right-click context menu"""
+        menu = create_card_menu(event.widget(), self)
+        menu.exec(event.screenPos())
+
+    def mousePressEvent(self, event):
+        """Handle mouse press for selection"""
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.card_clicked.emit(self.card_index)
+        event.accept()
+
+    def mouseDoubleClickEvent(self, event):
+        """Emit signal when card is double-clicked"""
+        self.card_double_clicked.emit(self.card_index)
+        event.accept()
+
+
+class ScenePreview(QGraphicsView, _SmoothScrollMixin):
+    """Scroll view over a BSP-indexed scene of card items; only visible cards are painted"""
+    empty_clicked = pyqtSignal()  # Click on empty space (for deselection)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._init_smooth_scroll()
+        self.cards = []
+        self.background_path = None
+        self._cached_scaled_bg = None
+        self._cached_bg_key = None
+
+        self.graphics_scene = QGraphicsScene(self)
+        self.graphics_scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+        self.setScene(self.graphics_scene)
+
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState, True)
+
+    def set_background(self, path):
+        """Set the background image from path"""
+        self.background_path = path
+        self._cached_scaled_bg = None
+        self._cached_bg_key = None
+        self.viewport().update()
+
+    def set_cards(self, cards):
+        """Show exactly the given card items, adding and removing only the difference"""
+        new_cards = list(cards)
+        keep = set(map(id, new_cards))
+        for card in self.cards:
+            if id(card) not in keep:
+                self.graphics_scene.removeItem(card)
+        for card in new_cards:
+            if card.scene() is None:
+                self.graphics_scene.addItem(card)
+        self.cards = new_cards
+        self.relayout()
+
+    def relayout(self):
+        """Position cards in a two-column grid sized to the viewport"""
+        width = self.viewport().width()
+        card_width = max(0, (width - 2 * GRID_MARGIN - (COLUMNS - 1) * GRID_SPACING) // COLUMNS)
+        for idx, card in enumerate(self.cards):
+            row = idx // COLUMNS
+            col = idx % COLUMNS
+            card.set_width(card_width)
+            card.setPos(GRID_MARGIN + col * (card_width + GRID_SPACING),
+                        GRID_MARGIN + row * (CARD_HEIGHT + GRID_SPACING))
+        rows = (len(self.cards) + COLUMNS - 1) // COLUMNS
+        height = 2 * GRID_MARGIN + max(0, rows * (CARD_HEIGHT + GRID_SPACING) - GRID_SPACING)
+        self.graphics_scene.setSceneRect(0, 0, width, max(height, self.viewport().height()))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.relayout()
+
+    def mousePressEvent(self, event):
+        if self.itemAt(event.pos()) is None:
+            self.empty_clicked.emit()
+        super().mousePressEvent(event)
+
+    def drawBackground(self, painter, rect):
+        painter.fillRect(rect, QColor("#f5f5f5"))
+        width = int(self.graphics_scene.sceneRect().width())
+        if width <= 0:
+            return
+        bg_key = (width, self.devicePixelRatioF())
+        if self._cached_scaled_bg is None or self._cached_bg_key != bg_key:
+            image = (get_preview_background(self.background_path, width, self.devicePixelRatioF())
+                     if self.background_path else None)
+            self._cached_scaled_bg = QPixmap.fromImage(image) if image is not None else None
+            self._cached_bg_key = bg_key
+        scaled_bg = self._cached_scaled_bg
+        if scaled_bg is None:
+            return
+
+        # Tile only inside exposed paint region (logical pixels)
+        bg_height = max(1, round(scaled_bg.deviceIndependentSize().height()))
+        y = (int(rect.top()) // bg_height) * bg_height
+        while y <= rect.bottom():
+            painter.drawPixmap(0, y, scaled_bg)
+            y += bg_height
@@ -0,0 +1,663 @@
+"""
+Match persistence for VCT Display Demo: JSON snapshot plus append-only journal
+"""
+import os
+import json
+import shutil
+import atexit
+import sqlite3
+import hashlib
+import threading
+import time
+
+from models import FIELD_COUNT
+from utils import normalize_team_name, parse_match_datetime
+
+JOURNAL_SUFFIX = ".journal"
+BACKUP_SUFFIX = ".bak"
+COMPACT_THRESHOLD = 500  # Journal records before a background compaction
+SAVE_DELAY = 0.5  # Seconds a burst of changes is coalesced before writing
+
+
+def apply_change(data, change, make_row=list):
+    """Apply one journal record to the match list in place; new rows go through make_row"""
+    op = change.get("op")
+    if op == "insert":
+        index = change["index"]
+        data[index:index] = [make_row(row) for row in change["rows"]]
+    elif op == "update":
+        data[change["index"]] = make_row(change["row"])
+    elif op == "delete":
+        index = change["index"]
+        del data[index:index + change.get("count", 1)]
+    elif op == "move":
+        data.insert(change["to"], data.pop(change["from"]))
+    elif op == "merge":
+        # rows land at the ascending final indexes; one O(n + k) pass
+        merged = []
+        source = iter(data)
+        for index, row in zip(change["indexes"], change["rows"]):
+            while len(merged) < index:
+                merged.append(next(source))
+            merged.append(make_row(row))
+        merged.extend(source)
+        data[:] = merged
+    elif op == "remove":
+        removed = set(change["indexes"])
+        data[:] = [row for i, row in enumerate(data) if i not in removed]
+    elif op == "reorder":
+        data[:] = [data[i] for i in change["order"]]
+    elif op == "clear":
+        data.clear()
+
+
+def fsync_write(path, payload):
+    """Write bytes to path via a temp file, fsync and rename (atomic replace)"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class WriteBehindSaver:
+    """Background writer that coalesces bursts of saves.
+
+    schedule(key, write) queues a write; a later write with the same key
+    replaces it. The worker waits SAVE_DELAY after the first pending write,
+    then runs everything queued, in order, off the GUI thread. flush() runs
+    pending writes immediately and is registered to run at exit.
+    """
+    def __init__(self, delay=SAVE_DELAY):
+        self.delay = delay
+        self._pending = {}  # key -> write callable
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()  # Serializes worker and flush()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def schedule(self, key, write):
+        """Queue write() to run soon; replaces a queued write with the same key"""
+        with self._condition:
+            self._pending.pop(key, None)
+            self._pending[key] = write
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self):
+        """Run every pending write now, in the calling thread"""
+        with self._write_lock:
+            self._write(self._take())
+
+    def _take(self):
+        with self._condition:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            # Let the rest of the burst arrive, then write once
+            time.sleep(self.delay)
+            with self._write_lock:
+                self._write(self._take())
+
+    @staticmethod
+    def _write(pending):
+        for write in pending.values():
+            try:
+                write()
+            except OSError:
+                pass
+
+
+# Shared saver for the match journal and settings.json
+saver = WriteBehindSaver()
+
+
+class MatchStore:
+    """matches.json snapshot with an append-only change journal next to it.
+
+    Every mutation appends one small JSON line to <snapshot>.journal, so a save
+    costs O(1) regardless of schedule size. Lines are buffered and appended by
+    the write-behind saver, one fsync'ed write per burst. load() replays the
+    journal over the snapshot; compaction folds it into a new snapshot in the
+    background.
+
+    The journal's first line names the snapshot it applies to by SHA-1. Before
+    a compaction swaps files it appends a marker naming the new snapshot and
+    the last record it contains, so a crash between the two renames can still
+    be replayed correctly. A torn last line (crash mid-append) is ignored.
+    """
+    def __init__(self, snapshot_path):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + JOURNAL_SUFFIX
+        self.seq = 0  # Sequence number of the last journal record
+        self.journal_records = 0
+        self._compacting = False
+        self._tail = None  # Lines recorded while a compaction is running
+        self._unwritten = []  # Journal lines waiting for the saver
+        self._generation = 0  # Bumped by every snapshot swap
+        self._lock = threading.Lock()  # Guards the in-memory state; never held during disk I/O
+        self._io_lock = threading.Lock()  # Serializes journal and snapshot writers
+
+    def exists(self):
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.journal_path)
+
+    def backup(self):
+        """Copy the snapshot and journal to *.bak (e.g. before replacing unreadable data); returns the copies"""
+        copies = []
+        for path in (self.snapshot_path, self.journal_path):
+            if os.path.exists(path):
+                shutil.copy2(path, path + BACKUP_SUFFIX)
+                copies.append(path + BACKUP_SUFFIX)
+        return copies
+
+    def load(self):
+        """Return the match list (snapshot + journal), or None if nothing is stored"""
+        if not self.exists():
+            return None
+        payload = b"[]"
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as f:
+                payload = f.read()
+        data = json.loads(payload.decode('utf-8'))
+        digest = hashlib.sha1(payload).hexdigest()
+
+        records, clean = self._read_journal(digest)
+        for record in records:
+            apply_change(data, record)
+            self.seq = max(self.seq, record.get("seq", 0))
+        self.journal_records = len(records)
+        if not clean:
+            # Journal was stale, torn or from an interrupted compaction: fold now
+            self.write_snapshot(data)
+        return data
+
+    def _read_journal(self, digest):
+        """(records to replay over the snapshot with this digest, journal is clean)"""
+        if not os.path.exists(self.journal_path):
+            return [], False
+        lines = []
+        clean = True
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    lines.append(json.loads(line))
+                except ValueError:
+                    clean = False  # Torn final append
+                    break
+        if not lines or lines[0].get("base") != digest:
+            clean = False
+            # Crash during compaction: the snapshot already holds records up to the marker
+            marker = next((line for line in lines if line.get("compacted") == digest), None)
+            if marker is None:
+                return [], False
+            return [line for line in lines if "op" in line and line["seq"] > marker["seq"]], False
+        return [line for line in lines if "op" in line], clean
+
+    def record(self, op, **fields):
+        """Queue one change (see apply_change) for appending to the journal"""
+        with self._lock:
+            self.seq += 1
+            # Match records serialize as their list form
+            line = json.dumps(dict(op=op, seq=self.seq, **fields), ensure_ascii=False, default=list) + "\n"
+            self._unwritten.append(line)
+            self.journal_records += 1
+            if self._tail is not None:
+                self._tail.append(line)
+        saver.schedule(("journal", self.journal_path), self.write_journal)
+
+    def write_journal(self):
+        """Append buffered journal lines in one write (called by the saver)"""
+        with self._io_lock:
+            with self._lock:
+                lines, self._unwritten = self._unwritten, []
+            try:
+                self._append_lines(lines)
+            except OSError:
+                with self._lock:
+                    self._unwritten[:0] = lines  # Retried with the next write
+                raise
+
+    def _append_lines(self, lines):
+        if not lines:
+            return
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def needs_compaction(self):
+        return self.journal_records >= COMPACT_THRESHOLD and not self._compacting
+
+    def compact_async(self, data):
+        """Fold the journal into a new snapshot of data on a background thread"""
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+            self._tail = []
+            rows = [list(row) for row in data]
+            seq = self.seq
+            generation = self._generation
+        threading.Thread(target=self._compact, args=(rows, seq, generation), daemon=True).start()
+
+    def write_snapshot(self, data):
+        """Write data as the snapshot and start an empty journal (synchronous)"""
+        with self._lock:
+            rows = [list(row) for row in data]
+            seq = self.seq
+        self._swap(self._stage(rows), seq)
+
+    def _compact(self, rows, seq, generation):
+        try:
+            self._swap(self._stage(rows), seq, generation)
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._compacting = False
+                self._tail = None
+
+    def _stage(self, rows):
+        """Serialize rows into a fsync'ed temp snapshot; returns (temp path, digest)"""
+        payload = json.dumps(rows, ensure_ascii=False, indent=2).encode('utf-8')
+        digest = hashlib.sha1(payload).hexdigest()
+        tmp_path = f"{self.snapshot_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        return tmp_path, digest
+
+    def _swap(self, staged, seq, generation=None):
+        """Install a staged snapshot and a journal holding the records after seq.
+
+        generation is the one a background compaction started from; it is
+        dropped if a synchronous snapshot (generation None) came in between.
+        The state is switched under the lock, the files are written after it.
+        """
+        tmp_path, digest = staged
+        with self._io_lock:
+            with self._lock:
+                if generation is not None and generation != self._generation:
+                    os.remove(tmp_path)
+                    return
+                # Lines older than the new snapshot go to the old journal; newer ones are in tail
+                lines, self._unwritten = self._unwritten, []
+                tail = self._tail if generation is not None else []
+                self._tail = None  # Later records only go to _unwritten, appended after this swap
+                self.journal_records = len(tail)
+                self._generation += 1
+            try:
+                self._append_lines(lines)
+            except OSError:
+                # The old snapshot and journal are still in place; keep the lines for the next write
+                with self._lock:
+                    self._unwritten[:0] = lines
+                raise
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({"compacted": digest, "seq": seq}) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            header = json.dumps({"base": digest}) + "\n"
+            fsync_write(self.journal_path, (header + "".join(tail)).encode('utf-8'))
+
+
+def match_columns(match_data):
+    """Indexed column values for a match row: (starts_at, tournament, team_a, team_b)"""
+    date_str = match_data[0] if len(match_data) > 0 else ""
+    time_str = match_data[1] if len(match_data) > 1 else ""
+    tournament = match_data[2] if len(match_data) > 2 else ""
+    teams = match_data[3] if len(match_data) > 3 else ""
+    year, month, day, hour, minute = parse_match_datetime(date_str, time_str)
+    starts_at = None if year == 9999 else f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}"
+    team_a, _, team_b = teams.partition(" vs ")
+    return (starts_at, tournament.strip().lower(),
+            normalize_team_name(team_a) if team_a.strip() else None,
+            normalize_team_name(team_b) if team_b.strip() else None)
+
+
+def filter_rows(rows, tournament=None, team=None):
+    """Rows (list form) passing the tournament / team filters of SqliteMatchStore.query"""
+    tournament_key = tournament.strip().lower() if tournament else None
+    code = normalize_team_name(team) if team else None
+    result = []
+    for row in rows:
+        _, row_tournament, team_a, team_b = match_columns(row)
+        if tournament_key and row_tournament != tournament_key:
+            continue
+        if code and code not in (team_a, team_b):
+            continue
+        result.append(row)
+    return result
+
+
+def write_json_rows(path, rows):
+    """Write rows (list form) as a matches.json-format file (atomically)"""
+    fsync_write(path, json.dumps([list(row) for row in rows], ensure_ascii=False, indent=2).encode('utf-8'))
+
+
+class SqliteMatchStore:
+    """Optional sqlite3 backend with the same interface as MatchStore.
+
+    The whole archive lives in one table indexed on parsed start time,
+    tournament and both team codes; load() returns only the rows inside the
+    viewed window (view_from..view_to as "Y.M.D", plus undated rows) in
+    display order. Changes recorded against that list are mapped to row ids
+    and executed by the write-behind saver in one transaction per burst.
+    """
+    POSITION_STEP = 1024.0  # Gap between neighbouring positions after renumbering
+    SCHEMA_VERSION = 1  # PRAGMA user_version once the archive has been migrated or written
+
+    def __init__(self, db_path, view_from=None, view_to=None):
+        self.db_path = db_path
+        self.view_from = view_from
+        self.view_to = view_to
+        self.ids = []  # Row id for each entry of the loaded list
+        self._next_id = 1
+        self._pending = []  # (kind, *args) work waiting for the saver
+        self._lock = threading.Lock()  # Guards ids and the queue; never held while the database is used
+        self._io_lock = threading.Lock()  # Serializes use of the connection
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS matches (
+                id INTEGER PRIMARY KEY,
+                position REAL NOT NULL,
+                date TEXT, time TEXT, tournament TEXT, teams TEXT, remarks TEXT, bo TEXT, match_id TEXT,
+                starts_at TEXT, tournament_key TEXT, team_a TEXT, team_b TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_matches_position ON matches(position);
+            CREATE INDEX IF NOT EXISTS idx_matches_starts_at ON matches(starts_at);
+        """)
+        # Databases created before imported matches carried their VLR id, or without the filter columns
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(matches)")]
+        for column in ("match_id", "tournament_key", "team_a", "team_b"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE matches ADD COLUMN {column} TEXT")
+        self._fill_filter_columns()
+        self._conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches(tournament_key, starts_at);
+            CREATE INDEX IF NOT EXISTS idx_matches_team_a ON matches(team_a, starts_at);
+            CREATE INDEX IF NOT EXISTS idx_matches_team_b ON matches(team_b, starts_at);
+        """)
+
+    def _fill_filter_columns(self):
+        """Compute the filter columns of rows stored without them"""
+        rows = self._conn.execute("SELECT id, date, time, tournament, teams FROM matches "
+                                  "WHERE tournament_key IS NULL").fetchall()
+        if rows:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE matches SET starts_at = ?, tournament_key = ?, team_a = ?, team_b = ? WHERE id = ?",
+                    [(*match_columns([value or "" for value in row[1:]]), row[0]) for row in rows])
+
+    @staticmethod
+    def _window_bound(date_str, end=False):
+        """starts_at bound for a "Y.M.D" window edge (inclusive), or None"""
+        if not date_str:
+            return None
+        year, month, day, _, _ = parse_match_datetime(date_str, "")
+        return f"{year:04d}-{month:02d}-{day:02d} " + ("23:59" if end else "00:00")
+
+    def exists(self):
+        """Whether the archive was initialized (migrated or written), even if now empty"""
+        with self._io_lock:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] >= self.SCHEMA_VERSION:
+                return True
+            # Databases written before the marker existed count once they hold rows
+            if self._conn.execute("SELECT 1 FROM matches LIMIT 1").fetchone() is None:
+                return False
+            self._mark_initialized()
+            return True
+
+    def _mark_initialized(self):
+        """Record that the archive holds the user's data (I/O lock held)"""
+        self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def backup(self):
+        """Copy the database to <db>.bak with sqlite's online backup; returns the copy"""
+        copy_path = self.db_path + BACKUP_SUFFIX
+        with self._io_lock:
+            target = sqlite3.connect(copy_path)
+            try:
+                self._conn.backup(target)
+            finally:
+                target.close()
+        return [copy_path]
+
+    def load(self):
+        """Return the matches in the viewed window, or None if the database was never initialized"""
+        if not self.exists():
+            return None
+        self.flush()
+        rows = self.query(self._window_bound(self.view_from), self._window_bound(self.view_to, True),
+                          include_undated=True, with_ids=True)
+        with self._io_lock:
+            next_id = (self._conn.execute("SELECT MAX(id) FROM matches").fetchone()[0] or 0) + 1
+        with self._lock:
+            self._next_id = next_id
+            self.ids = [row[0] for row in rows]
+        return [self._row(row[2:]) for row in rows]
+
+    @staticmethod
+    def _row(values):
+        """List form of the stored fields (match_id only when set, as Match.to_list)"""
+        return list(values) if values[FIELD_COUNT - 1] else list(values[:FIELD_COUNT - 1])
+
+    @staticmethod
+    def _values(row):
+        return [row[i] if i < len(row) else "" for i in range(FIELD_COUNT)]
+
+    def query(self, start=None, end=None, tournament=None, team=None, include_undated=False,
+              with_ids=False):
+        """Matches filtered through the indexes, in display order.
+
+        start/end bound the parsed start time ("YYYY-MM-DD HH:MM" strings),
+        tournament and team are matched case-insensitively / by team code.
+        """
+        clauses, params = [], []
+        if start is not None or end is not None:
+            bounds = []
+            if start is not None:
+                bounds.append("starts_at >= ?")
+                params.append(start)
+            if end is not None:
+                bounds.append("starts_at <= ?")
+                params.append(end)
+            dated = " AND ".join(bounds)
+            clauses.append(f"(({dated}) OR starts_at IS NULL)" if include_undated else dated)
+        if tournament:
+            clauses.append("tournament_key = ?")
+            params.append(tournament.strip().lower())
+        if team:
+            code = normalize_team_name(team)
+            clauses.append("(team_a = ? OR team_b = ?)")
+            params += [code, code]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        columns = "id, position, date, time, tournament, teams, remarks, bo, COALESCE(match_id, '')"
+        with self._io_lock:
+            rows = self._conn.execute(f"SELECT {columns} FROM matches {where} ORDER BY position",
+                                      params).fetchall()
+        return rows if with_ids else [self._row(row[2:]) for row in rows]
+
+    def record(self, op, **fields):
+        """Map one change on the loaded list (see apply_change) to queued work for the saver.
+
+        Only row ids are tracked here; positions are resolved against the
+        whole table when the saver executes the queue, so recording never
+        touches the database.
+        """
+        with self._lock:
+            if op == "insert":
+                self._insert(fields["index"], fields["rows"])
+            elif op == "update":
+                self._queue_update(self.ids[fields["index"]], fields["row"])
+            elif op == "delete":
+                index = fields["index"]
+                count = fields.get("count", 1)
+                for row_id in self.ids[index:index + count]:
+                    self._queue_delete(row_id)
+                del self.ids[index:index + count]
+            elif op == "move":
+                row_id = self.ids.pop(fields["from"])
+                self._pending.append(("place", [row_id], *self._neighbours(fields["to"])))
+                self.ids.insert(fields["to"], row_id)
+            elif op == "merge":
+                for index, row in zip(fields["indexes"], fields["rows"]):
+                    self._insert(index, [row])
+            elif op == "remove":
+                for index in reversed(fields["indexes"]):
+                    self._queue_delete(self.ids.pop(index))
+            elif op == "reorder":
+                self.ids = [self.ids[i] for i in fields["order"]]
+                self._pending.append(("reorder", list(self.ids)))
+            elif op == "clear":
+                for row_id in self.ids:
+                    self._queue_delete(row_id)
+                self.ids = []
+        saver.schedule(("sqlite", self.db_path), self.flush)
+
+    def _neighbours(self, index):
+        """(row id before, row id after) a slot of the loaded list, None at its ends (lock held)"""
+        return (self.ids[index - 1] if index > 0 else None,
+                self.ids[index] if index < len(self.ids) else None)
+
+    def _insert(self, index, rows):
+        """Queue rows for insertion before the entry at index (lock held)"""
+        row_ids = list(range(self._next_id, self._next_id + len(rows)))
+        self._next_id += len(rows)
+        self._pending.append(("insert", row_ids, [self._values(row) for row in rows], *self._neighbours(index)))
+        self.ids[index:index] = row_ids
+
+    def _queue_update(self, row_id, row):
+        values = self._values(row)
+        self._pending.append((
+            "sql",
+            "UPDATE matches SET date = ?, time = ?, tournament = ?, teams = ?, remarks = ?, bo = ?, match_id = ?, "
+            "starts_at = ?, tournament_key = ?, team_a = ?, team_b = ? WHERE id = ?",
+            (*values, *match_columns(values), row_id)))
+
+    def _queue_delete(self, row_id):
+        self._pending.append(("sql", "DELETE FROM matches WHERE id = ?", (row_id,)))
+
+    def _positions_between(self, prev_id, next_id, count):
+        """count evenly spaced positions after row prev_id (or before next_id) in the whole table.
+
+        Rows outside the loaded window can sit between loaded neighbours, so
+        the gap ends at the next position in the table, not in the window.
+        """
+        position_of = "SELECT position FROM matches WHERE id = ?"
+        before = after = None
+        if prev_id is not None:
+            before = self._conn.execute(position_of, (prev_id,)).fetchone()[0]
+            after = self._conn.execute("SELECT MIN(position) FROM matches WHERE position > ?",
+                                       (before,)).fetchone()[0]
+        elif next_id is not None:
+            after = self._conn.execute(position_of, (next_id,)).fetchone()[0]
+            before = self._conn.execute("SELECT MAX(position) FROM matches WHERE position < ?",
+                                        (after,)).fetchone()[0]
+        else:
+            before = self._conn.execute("SELECT MAX(position) FROM matches").fetchone()[0]
+        if before is None:
+            before = (after if after is not None else 0.0) - self.POSITION_STEP
+        if after is None:
+            after = before + self.POSITION_STEP * (count + 1)
+        step = (after - before) / (count + 1)
+        if step <= abs(before) * 1e-12:
+            self._renumber()
+            return self._positions_between(prev_id, next_id, count)
+        return [before + step * offset for offset in range(1, count + 1)]
+
+    def _renumber(self):
+        """Spread all positions POSITION_STEP apart again (inside the saver's transaction)"""
+        ordered = [row[0] for row in self._conn.execute("SELECT id FROM matches ORDER BY position")]
+        self._conn.executemany("UPDATE matches SET position = ? WHERE id = ?",
+                               [((i + 1) * self.POSITION_STEP, row_id) for i, row_id in enumerate(ordered)])
+
+    def flush(self):
+        """Execute the queued work in one transaction"""
+        with self._io_lock:
+            self._execute_pending()
+
+    def _execute_pending(self):
+        """Take the queue under the state lock and run it without it (I/O lock held)"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            self._run(pending)
+        except sqlite3.Error as e:
+            with self._lock:
+                self._pending[:0] = pending  # Retried with the next flush
+            raise OSError(f"sqlite: {e}") from e
+
+    def _run(self, pending):
+        with self._conn:
+            for kind, *args in pending:
+                if kind == "sql":
+                    self._conn.execute(*args)
+                elif kind == "insert":
+                    row_ids, rows, prev_id, next_id = args
+                    positions = self._positions_between(prev_id, next_id, len(rows))
+                    self._conn.executemany(
+                        "INSERT INTO matches (id, position, date, time, tournament, teams, remarks, bo, match_id, "
+                        "starts_at, tournament_key, team_a, team_b) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(row_id, position, *values, *match_columns(values))
+                         for row_id, position, values in zip(row_ids, positions, rows)])
+                elif kind == "place":
+                    row_ids, prev_id, next_id = args
+                    positions = self._positions_between(prev_id, next_id, len(row_ids))
+                    self._conn.executemany("UPDATE matches SET position = ? WHERE id = ?", zip(positions, row_ids))
+                elif kind == "reorder":
+                    # The rows keep their set of positions and take them in the new order
+                    row_ids = args[0]
+                    positions = sorted(self._conn.execute("SELECT position FROM matches WHERE id = ?",
+                                                          (row_id,)).fetchone()[0] for row_id in row_ids)
+                    self._conn.executemany("UPDATE matches SET position = ? WHERE id = ?", zip(positions, row_ids))
+        self._mark_initialized()
+
+    def needs_compaction(self):
+        return False
+
+    def compact_async(self, data):
+        pass
+
+    def write_snapshot(self, data):
+        """Replace the loaded window with data"""
+        self.record("clear")
+        self.record("insert", index=0, rows=data)
+        self.flush()
+
+    def import_rows(self, rows):
+        """Bulk-append matches (list form) after the archive; returns the count"""
+        with self._io_lock:
+            self._execute_pending()
+            last = self._conn.execute("SELECT MAX(position) FROM matches").fetchone()[0] or 0.0
+            start_id = (self._conn.execute("SELECT MAX(id) FROM matches").fetchone()[0] or 0) + 1
+            with self._lock:
+                self._next_id = max(self._next_id, start_id + len(rows))
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO matches (id, position, date, time, tournament, teams, remarks, bo, match_id, "
+                    "starts_at, tournament_key, team_a, team_b) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(start_id + i, last + (i + 1) * self.POSITION_STEP, *values, *match_columns(values))
+                     for i, values in enumerate(self._values(row) for row in rows)])
+            self._mark_initialized()
+        return len(rows)
+
+    def export_json(self, path, tournament=None, team=None):
+        """Write the whole archive (or the matches passing the filters) in matches.json format; returns the count"""
+        self.flush()
+        rows = self.query(tournament=tournament, team=team)
+        write_json_rows(path, rows)
+        return len(rows)
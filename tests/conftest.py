@@ -0,0 +1,28 @@
+"""
+Shared fixtures for the VCT Display Demo tests
+"""
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def widget(qapp, tmp_path, monkeypatch):
+    """PreviewWidget with its matches and settings files in a temporary directory"""
+    from preview import PreviewWidget
+    from storage import saver
+    monkeypatch.chdir(tmp_path)
+    preview = PreviewWidget()
+    preview.populate_initial_data()
+    yield preview
+    saver.flush()  # Pending writes use relative paths; finish them inside tmp_path
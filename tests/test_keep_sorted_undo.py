@@ -0,0 +1,62 @@
+"""
+Undo/redo must never leave the auto-sort mode on over an unsorted schedule
+"""
+import random
+
+import pytest
+from PyQt6.QtWidgets import QMessageBox
+
+from models import Match
+
+
+def unsorted_rows():
+    return [Match.from_list([f"2026.3.{day}", "10:00", "masters", f"t{day} vs x", "", "BO3"])
+            for day in (5, 1, 4, 2, 3)]
+
+
+def load_unsorted(widget):
+    widget.apply_edit("clear")
+    widget.apply_edit("insert", index=0, rows=unsorted_rows())
+    widget.history.clear()
+
+
+def test_undo_turning_on_auto_sort_turns_it_off(widget):
+    load_unsorted(widget)
+    widget.keep_sorted_check.setChecked(True)
+    assert widget.keep_sorted and widget.is_sorted()
+
+    widget.undo()
+    assert not widget.keep_sorted
+    assert not widget.keep_sorted_check.isChecked()
+    assert [match.date for match in widget.data] == [match.date for match in unsorted_rows()]
+
+    widget.redo()
+    assert widget.keep_sorted and widget.keep_sorted_check.isChecked()
+    assert widget.is_sorted()
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random_edits_with_undo_keep_order(widget, monkeypatch, seed):
+    monkeypatch.setattr(QMessageBox, "question", lambda *args: QMessageBox.StandardButton.Yes)
+    rng = random.Random(seed)
+    load_unsorted(widget)
+    for _ in range(60):
+        action = rng.choice(["paste", "delete", "toggle", "sort", "undo", "undo", "redo"])
+        if action == "paste":
+            day, hour = rng.randint(1, 6), rng.randint(0, 23)
+            widget.clipboard_data = [f"2026.3.{day}", f"{hour:02d}:00", "emea", "fnc vs navi", "", ""]
+            widget.selected_index = rng.randrange(len(widget.data)) if widget.data else -1
+            widget.paste_match()
+        elif action == "delete" and widget.data:
+            widget.delete_match(rng.randrange(len(widget.data)))
+        elif action == "toggle":
+            widget.keep_sorted_check.setChecked(not widget.keep_sorted)
+        elif action == "sort":
+            widget.sort_by_time()
+        elif action == "undo":
+            widget.undo()
+        elif action == "redo":
+            widget.redo()
+        assert widget.keep_sorted_check.isChecked() == widget.keep_sorted
+        if widget.keep_sorted:
+            assert widget.is_sorted(), f"unsorted after {action}"
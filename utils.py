@@ -2,6 +2,9 @@
 Utility functions for VCT Display Demo
 """
 import os
+from datetime import date
+from atlas import icon_atlas
+from bundle import asset_exists  # Asset access goes through the bundle when present
 from config import IMAGES_DIR, TEAMS_BY_REGION, TEAM_NAME_MAPPING
 
 
@@ -19,6 +22,32 @@ def normalize_team_name(team_name):
     return team_lower
 
 
+def parse_match_datetime(date_str, time_str):
+    """Sort key (year, month, day, hour, minute) for a match's date and time strings.
+
+    Dates are Y.M.D or M.D (current year); unparseable dates sort last and
+    unparseable times as 00:00.
+    """
+    try:
+        parts = date_str.split('.')
+        if len(parts) == 3:
+            year, month, day = map(int, parts)
+        elif len(parts) == 2:
+            month, day = map(int, parts)
+            year = date.today().year
+        else:
+            year, month, day = 9999, 12, 31
+    except ValueError:
+        year, month, day = 9999, 12, 31
+
+    try:
+        hour, minute = map(int, time_str.split(':'))
+    except ValueError:
+        hour, minute = 0, 0
+
+    return (year, month, day, hour, minute)
+
+
 def get_team_icon_path(team_name):
     """Get the icon path for a team"""
     team_lower = normalize_team_name(team_name)
@@ -34,12 +63,16 @@ def get_tournament_icon_path(tournament_name):
     # Handle mapping for amer -> americas
     if name == "amer":
         name = "americas"
-    # Check for png first, then jpg
+    # Check for png first, then jpg (the atlas index avoids stat'ing either)
     png_path = os.path.join(IMAGES_DIR, "vct", f"{name}.png")
-    if os.path.exists(png_path):
-        return png_path
     jpg_path = os.path.join(IMAGES_DIR, "vct", f"{name}.jpg")
-    if os.path.exists(jpg_path):
+    if icon_atlas.contains(png_path):
+        return png_path
+    if icon_atlas.contains(jpg_path):
+        return jpg_path
+    if asset_exists(png_path):
+        return png_path
+    if asset_exists(jpg_path):
         return jpg_path
     return png_path  # Return png path as default
 
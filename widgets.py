@@ -1,14 +1,13 @@
 """
 Custom widgets for VCT Display Demo
 """
-import os
 from PyQt6.QtWidgets import (QSpinBox, QWidget, QVBoxLayout, QLabel, QComboBox,
                              QInputDialog, QMessageBox, QScrollArea, QListWidget,
                              QAbstractItemView)
 from PyQt6.QtCore import QSize
-from PyQt6.QtGui import QIcon
 
 from config import TEAMS_BY_REGION
+from image_cache import get_icon
 from utils import get_tournament_icon_path, get_team_icon_path
 
 
@@ -80,9 +79,9 @@ class TeamPickerWidget(QWidget):
         self.region_combo.setMinimumWidth(140)
         self.region_combo.view().setMinimumWidth(160)
         for region in TEAMS_BY_REGION.keys():
-            icon_path = get_tournament_icon_path(region)
-            if icon_path and os.path.exists(icon_path):
-                self.region_combo.addItem(QIcon(icon_path), region.upper(), region)
+            icon = get_icon(get_tournament_icon_path(region), 24)
+            if icon is not None:
+                self.region_combo.addItem(icon, region.upper(), region)
             else:
                 self.region_combo.addItem(region.upper(), region)
         self.region_combo.currentIndexChanged.connect(self.update_teams)
@@ -121,9 +120,9 @@ class TeamPickerWidget(QWidget):
         region = self.region_combo.currentData()
         if region and region in TEAMS_BY_REGION:
             for team in TEAMS_BY_REGION[region]:
-                icon_path = get_team_icon_path(team)
-                if icon_path and os.path.exists(icon_path):
-                    self.team_combo.addItem(QIcon(icon_path), team.upper(), team)
+                icon = get_icon(get_team_icon_path(team), 24)
+                if icon is not None:
+                    self.team_combo.addItem(icon, team.upper(), team)
                 else:
                     self.team_combo.addItem(team.upper(), team)
     